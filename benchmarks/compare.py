@@ -0,0 +1,66 @@
+"""
+    compare two benchmark result files, every metric is "lower is better", except counts of a fixed workload
+    (eg: feed.keep.items), which must not change
+        python -m benchmarks.compare base.json head.json --threshold 0.1
+    exit code is 1 if any metric is slower than base by more than threshold, or if a count changed
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import sys
+
+# leaf names of metrics which must be equal in base and head, eg: items streamed from a list of fixed size
+EXACT = {"items"}
+
+
+def flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(base: dict, head: dict, threshold: float) -> list[tuple[str, float, float, float, bool]]:
+    """
+    :return: list of (metric, base, head, relative change, regressed)
+    """
+    base_flat, head_flat = flatten(base["results"]), flatten(head["results"])
+    rows = []
+    for name in sorted(base_flat.keys() & head_flat.keys()):
+        old, new = base_flat[name], head_flat[name]
+        if old:
+            change = (new - old) / old
+        else:
+            # any growth from a zero base is a regression, eg: pool_miss_rate 0 -> 1
+            change = float("inf") if new > 0 else 0.0
+        regressed = new != old if name.rsplit(".", 1)[-1] in EXACT else change > threshold
+        rows.append((name, old, new, change, regressed))
+    return rows
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="compare easy_chrome benchmark results")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown to report as regression")
+    args = parser.parse_args(argv)
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    rows = compare(base, head, args.threshold)
+    print(f"base: {base.get('commit')}  head: {head.get('commit')}")
+    for name, old, new, change, regressed in rows:
+        print(f"{'REGRESSED ' if regressed else '          '}{name:<60} {old:>12.6f} {new:>12.6f} {change:>+8.1%}")
+    sys.exit(1 if any(row[-1] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
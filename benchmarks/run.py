@@ -0,0 +1,240 @@
+"""
+    offline benchmarks for easy_chrome, pages are served by a local FixtureServer
+        python -m benchmarks.run --output results.json
+        python -m benchmarks.run --only wait_latency,extraction --repeat 3
+    every metric is "lower is better": seconds, or WebDriver round trips, except item counts, which must not change
+    compare two result files with: python -m benchmarks.compare base.json head.json
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from easy_chrome import Driver, DriverPool
+
+from .server import FixtureServer
+
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def _stats(samples: list[float]) -> dict:
+    samples = sorted(samples)
+    return {"median": statistics.median(samples),
+            "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            "min": samples[0]}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _driver(**kwargs) -> Driver:
+    return Driver.set_chrome(headless=True, **kwargs)
+
+
+def _round_trips(driver: Driver) -> int:
+    return sum(stats["count"] for stats in driver.metrics.summary()["commands"].values())
+
+
+@benchmark
+def import_time(server: FixtureServer, repeat: int) -> dict:
+    """seconds to import the package, and to import Driver, in a fresh interpreter"""
+    result = {}
+    for name, statement in (("package", "import easy_chrome"), ("driver", "from easy_chrome import Driver")):
+        code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+        samples = [float(subprocess.check_output([sys.executable, "-c", code], text=True)) for _ in range(repeat)]
+        result[name] = _stats(samples)
+    return result
+
+
+@benchmark
+def startup(server: FixtureServer, repeat: int) -> dict:
+    """cold start: set_chrome + first page, warm start: checkout from DriverPool + first page"""
+    cold = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        driver = _driver()
+        driver.get(server.url("/final"))
+        cold.append(time.perf_counter() - start)
+        driver.quit()
+
+    warm = []
+    with DriverPool(size=1, headless=True) as pool:
+        # let the pool launch its driver before measuring
+        with pool.driver():
+            pass
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with pool.driver() as driver:
+                driver.get(server.url("/final"))
+                warm.append(time.perf_counter() - start)
+        stats = pool.stats
+    return {"cold": _stats(cold), "warm": _stats(warm), "pool_miss_rate": 1 - stats["hit_rate"]}
+
+
+@benchmark
+def wait_latency(server: FixtureServer, repeat: int) -> dict:
+    """seconds between element insertion and wait_presence return, by wait engine"""
+    result = {}
+    driver = _driver()
+    try:
+        for engine in ("polling", "observer"):
+            driver.wait_engine = engine
+            samples = []
+            for _ in range(repeat):
+                driver.get(server.url("/delayed?delay=300"))
+                driver.wait_presence("//div[@id='late']", wait_time=10)
+                returned = time.time()
+                inserted = driver.execute_script("return window.__insertedAt;") / 1000
+                samples.append(returned - inserted)
+            result[engine] = _stats(samples)
+    finally:
+        driver.quit()
+    return result
+
+
+@benchmark
+def extraction(server: FixtureServer, repeat: int, rows: int = 500) -> dict:
+    """seconds and WebDriver round trips per element to read text and href of a large table"""
+    result = {}
+    driver = _driver()
+    try:
+        driver.get(server.url(f"/table?rows={rows}"))
+        ways = {
+            "get_elements": lambda: [(e.text, e.get_attribute("href")) for e in driver.get_elements("//tr/td[1]/a")],
+            "extract": lambda: driver.extract("//tr/td[1]/a", fields={"text": "text", "href": "@href"}),
+        }
+        for name, read in ways.items():
+            samples = []
+            for _ in range(repeat):
+                metrics = driver.enable_metrics()
+                start = time.perf_counter()
+                count = len(read())
+                samples.append(time.perf_counter() - start)
+                trips = _round_trips(driver)
+                metrics.reset()
+            result[name] = {**_stats(samples), "round_trips_per_element": trips / count}
+    finally:
+        driver.disable_metrics()
+        driver.quit()
+    return result
+
+
+@benchmark
+def redirect(server: FixtureServer, repeat: int) -> dict:
+    """seconds from get to wait_redirected return, for http and javascript redirect chains"""
+    result = {}
+    for log in (False, True):
+        driver = _driver(performance_log=log)
+        try:
+            for path in ("/redirect?hops=3", "/js-redirect?hops=3"):
+                samples = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    driver.get(server.url(path))
+                    driver.wait_redirected()
+                    samples.append(time.perf_counter() - start)
+                kind = "http" if path.startswith("/redirect") else "js"
+                result[f"{kind}_{'events' if log else 'ready_state'}"] = _stats(samples)
+        finally:
+            driver.quit()
+    return result
+
+
+@benchmark
+def shadow(server: FixtureServer, repeat: int, depth: int = 3) -> dict:
+    """seconds and WebDriver round trips to reach a button nested in shadow roots"""
+    driver = _driver()
+    try:
+        driver.get(server.url(f"/shadow?depth={depth}"))
+        samples = []
+        for _ in range(repeat):
+            metrics = driver.enable_metrics()
+            start = time.perf_counter()
+            root = driver
+            for i in range(depth):
+                root = driver.expand_shadow_element(root.find_element("css selector", f"host-{i}"))
+            root.find_element("css selector", "#deep")
+            samples.append(time.perf_counter() - start)
+            trips = _round_trips(driver)
+            metrics.reset()
+        result = {"expand_shadow_element": {**_stats(samples), "round_trips": trips}}
+
+        selector = " >>> ".join([f"host-{i}" for i in range(depth)] + ["#deep"])
+        for cache in (False, True):
+            samples = []
+            for _ in range(repeat):
+                metrics = driver.enable_metrics()
+                start = time.perf_counter()
+                driver.get_deep(selector, cache=cache)
+                samples.append(time.perf_counter() - start)
+                trips = _round_trips(driver)
+                metrics.reset()
+            result["get_deep_cached" if cache else "get_deep"] = {**_stats(samples), "round_trips": trips}
+        return result
+    finally:
+        driver.disable_metrics()
+        driver.quit()
+
+
+@benchmark
+def feed(server: FixtureServer, repeat: int, total: int = 2000) -> dict:
+    """seconds to stream an infinite scroll list with iter_elements, and items left in DOM"""
+    result = {}
+    for remove in (False, True):
+        driver = _driver()
+        try:
+            samples = []
+            for _ in range(repeat):
+                driver.get(server.url(f"/feed?total={total}&page=50"))
+                start = time.perf_counter()
+                count = sum(1 for _ in driver.iter_elements("//div[@class='item']", fields={"text": "text"},
+                                                            remove=remove, idle_time=1))
+                # idle_time is spent after the last item, not part of streaming
+                samples.append(time.perf_counter() - start - 1)
+                in_dom = driver.execute_script("return document.getElementsByClassName('item').length;")
+            result["remove" if remove else "keep"] = {**_stats(samples), "items": count, "items_in_dom": in_dom}
+        finally:
+            driver.quit()
+    return result
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="easy_chrome benchmarks")
+    parser.add_argument("--output", default="bench_results.json", help="result file")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per measurement")
+    parser.add_argument("--only", default="", help=f"comma separated, from: {','.join(BENCHMARKS)}")
+    args = parser.parse_args(argv)
+
+    names = [name for name in args.only.split(",") if name] or list(BENCHMARKS)
+    results = {}
+    with FixtureServer() as server:
+        for name in names:
+            print(f"running {name}...", file=sys.stderr)
+            results[name] = BENCHMARKS[name](server, args.repeat)
+
+    report = {"commit": _git_commit(),
+              "python": platform.python_version(),
+              "platform": platform.platform(),
+              "timestamp": time.time(),
+              "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
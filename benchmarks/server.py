@@ -0,0 +1,135 @@
+"""
+    local http server with generated fixture pages for benchmarks
+    - /table?rows=N&cols=M: large table
+    - /delayed?delay=MS: element //div[@id='late'] is inserted MS after load, insert time in window.__insertedAt
+    - /redirect?hops=N: chain of N http redirects, then /final
+    - /js-redirect?hops=N: chain of N location.replace redirects, then /final
+    - /shadow?depth=N: button nested in N shadow roots, hosts are <host-0>, <host-1>...
+    - /feed?total=N&page=M: infinite scroll list, M items are appended on each scroll to the bottom
+"""
+
+from __future__ import annotations
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+def _page(body: str, script: str = "") -> bytes:
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>fixture</title></head>"
+            f"<body>{body}<script>{script}</script></body></html>").encode()
+
+
+def table_page(rows: int, cols: int) -> bytes:
+    cells = "".join(f"<td>c{c}</td>" for c in range(1, cols))
+    body = "".join(f"<tr><td><a href='/item/{r}'>row {r}</a></td>{cells}</tr>" for r in range(rows))
+    return _page(f"<table id='data'><tbody>{body}</tbody></table>")
+
+
+def delayed_page(delay: int) -> bytes:
+    script = f"""
+    window.addEventListener('load', function () {{
+        setTimeout(function () {{
+            var div = document.createElement('div');
+            div.id = 'late';
+            div.textContent = 'late';
+            document.body.appendChild(div);
+            window.__insertedAt = Date.now();
+        }}, {delay});
+    }});
+    """
+    return _page("<div id='early'>early</div>", script)
+
+
+def shadow_page(depth: int) -> bytes:
+    script = f"""
+    var parent = document.body;
+    for (var i = 0; i < {depth}; i++) {{
+        var host = document.createElement('host-' + i);
+        parent.appendChild(host);
+        parent = host.attachShadow({{mode: 'open'}});
+    }}
+    var button = document.createElement('button');
+    button.id = 'deep';
+    button.textContent = 'deep';
+    parent.appendChild(button);
+    """
+    return _page("", script)
+
+
+def feed_page(total: int, page: int) -> bytes:
+    script = f"""
+    var loaded = 0, list = document.getElementById('feed');
+    function more() {{
+        for (var i = 0; i < {page} && loaded < {total}; i++, loaded++) {{
+            var item = document.createElement('div');
+            item.className = 'item';
+            item.style.height = '40px';
+            item.textContent = 'item ' + loaded;
+            list.appendChild(item);
+        }}
+    }}
+    more();
+    window.addEventListener('scroll', function () {{
+        if (window.innerHeight + window.scrollY >= document.body.offsetHeight - 10) setTimeout(more, 50);
+    }});
+    """
+    return _page("<div id='feed'></div>", script)
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body: bytes, status: int = 200, headers: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: int(v[0]) for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/table":
+            self._send(table_page(query.get("rows", 1000), query.get("cols", 5)))
+        elif url.path == "/delayed":
+            self._send(delayed_page(query.get("delay", 1000)))
+        elif url.path == "/redirect":
+            hops = query.get("hops", 3)
+            location = f"/redirect?hops={hops - 1}" if hops > 1 else "/final"
+            self._send(b"", 302, {"Location": location})
+        elif url.path == "/js-redirect":
+            hops = query.get("hops", 3)
+            location = f"/js-redirect?hops={hops - 1}" if hops > 1 else "/final"
+            self._send(_page("", f"setTimeout(function () {{ location.replace('{location}'); }}, 100);"))
+        elif url.path == "/shadow":
+            self._send(shadow_page(query.get("depth", 3)))
+        elif url.path == "/feed":
+            self._send(feed_page(query.get("total", 1000), query.get("page", 50)))
+        elif url.path == "/final":
+            self._send(_page("<div id='final'>final</div>"))
+        else:
+            self._send(_page("not found"), 404)
+
+
+class FixtureServer:
+    """serve fixture pages from a background thread, eg: with FixtureServer() as server: server.url('/table')"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, path: str) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -1 +1,46 @@
-from .driver import Driver
+"""
+    submodules are imported on first access, so `import easy_chrome` does not load selenium or webdriver_manager
+    until they are needed
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .async_driver import AsyncDriver, AsyncElement, AsyncRunner
+    from .driver import Driver
+    from .element import Element
+    from .pool import DriverPool
+    from .profile import build_profile_template, clone_profile
+    from .supervisor import DriverSupervisor
+    from .tabs import TabResult, TabScheduler
+    from .utils import WaitList
+
+_LAZY_ATTRIBUTES = {
+    "AsyncDriver": ".async_driver",
+    "AsyncElement": ".async_driver",
+    "AsyncRunner": ".async_driver",
+    "Driver": ".driver",
+    "DriverPool": ".pool",
+    "DriverSupervisor": ".supervisor",
+    "Element": ".element",
+    "TabResult": ".tabs",
+    "TabScheduler": ".tabs",
+    "WaitList": ".utils",
+    "build_profile_template": ".profile",
+    "clone_profile": ".profile",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
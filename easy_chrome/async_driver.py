@@ -0,0 +1,246 @@
+"""
+    This module is an asyncio facade for Driver and Element, to run many browsers from one event loop
+    - WebDriver calls run on a bounded thread pool (AsyncRunner), callers wait on a semaphore when it is full
+    - shortcuts return AsyncElement, fixed delays use asyncio.sleep
+    - other Driver / WebElement methods and properties are also available as coroutines, elements they return are
+      AsyncElement, iterators they return (eg: iter_elements) are async iterators
+    - AsyncElement can be passed back to any of them, also inside lists, eg: execute_script, switch_to.frame
+        eg:
+            driver = await AsyncDriver.set_chrome(headless=True)
+            await driver.get(url)
+            title = await driver.title
+            element = await driver.wait_visible(input_xpath)
+            await element.clear_and_type(user_name)
+            async for item in await driver.iter_elements(item_xpath):
+                print(await item.text)
+            await driver.execute_script("arguments[0].click();", element)
+            await (await driver.switch_to).frame(await driver.get_element(iframe_xpath))
+"""
+
+from __future__ import annotations
+import asyncio
+import functools
+import types
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.webdriver.remote.switch_to import SwitchTo
+from selenium.webdriver.remote.webelement import WebElement
+
+from .driver import Driver
+from .element import Element
+
+
+class AsyncRunner:
+    def __init__(self, max_workers: int = 16):
+        """
+        :param max_workers: max WebDriver calls running at the same time
+        """
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="easy_chrome")
+        # a semaphore is bound to the loop it is first used in, keep one per loop (eg: many asyncio.run)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    async def run(self, func, *args, **kwargs):
+        """run blocking func in thread pool, wait for a free worker first"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_workers)
+        async with semaphore:
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
+
+
+default_runner = AsyncRunner()
+
+# returned by next() in the thread pool when the iterator is exhausted
+_DONE = object()
+
+
+def _wrap(result, runner: AsyncRunner):
+    """wrap elements and iterators returned by WebDriver calls, so later calls on them do not block the event loop"""
+    if isinstance(result, WebElement):
+        return AsyncElement(result if isinstance(result, Element) else Element(result), runner)
+    if isinstance(result, list) and result and all(isinstance(item, WebElement) for item in result):
+        return [_wrap(item, runner) for item in result]
+    if isinstance(result, types.GeneratorType):
+        return _AsyncIterator(result, runner)
+    if isinstance(result, SwitchTo):
+        # switch_to.frame(element) calls WebDriver too
+        return _AsyncProxy(result, runner)
+    return result
+
+
+def _unwrap(value):
+    """pass the wrapped Element of AsyncElement arguments to WebDriver calls, which serialize elements by type"""
+    if isinstance(value, AsyncElement):
+        return value.element
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in value.items()}
+    return value
+
+
+class _AsyncIterator:
+    """async iterator over a blocking iterator, eg: Driver.iter_elements, each next() runs in thread pool"""
+
+    def __init__(self, iterator, runner: AsyncRunner):
+        self._iterator = iterator
+        self._runner = runner
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self._runner.run(next, self._iterator, _DONE)
+        if item is _DONE:
+            raise StopAsyncIteration
+        return _wrap(item, self._runner)
+
+    async def aclose(self):
+        """close the iterator, its cleanup calls WebDriver too"""
+        close = getattr(self._iterator, "close", None)
+        if close is not None:
+            await self._runner.run(close)
+
+
+class _AsyncProxy:
+    """forward unknown attributes of the wrapped object as coroutines"""
+
+    def __init__(self, target, runner: AsyncRunner):
+        self._target = target
+        self._runner = runner
+
+    def _run(self, func, *args, **kwargs):
+        return self._runner.run(func, *_unwrap(args), **_unwrap(kwargs))
+
+    def _wrap(self, result):
+        return _wrap(result, self._runner)
+
+    async def _run_wrapped(self, func, *args, **kwargs):
+        return self._wrap(await self._run(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        # properties (eg: title, current_url, text) call WebDriver, return a coroutine instead of blocking
+        if isinstance(getattr(type(self._target), name, None), property):
+            return self._run_wrapped(getattr, self._target, name)
+
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self._run_wrapped(attr, *args, **kwargs)
+
+        return method
+
+
+class AsyncElement(_AsyncProxy):
+    def __init__(self, element: Element, runner: AsyncRunner = default_runner):
+        super().__init__(element, runner)
+        self.element = element
+
+    async def clear_and_type(self, content: str, delay: float | None = None,
+                             timeout: float = Element._auto_wait_timeout):
+        """clear input and type content, when element is actionable, or with fixed delay between"""
+        if delay is None:
+            await self._run(self.element.clear_and_type, content, None, timeout)
+            return
+        await self._run(self.element.clear)
+        await asyncio.sleep(delay)
+        await self._run(self.element.send_keys, content)
+
+    async def get_element(self, xpath) -> AsyncElement:
+        """get element by Xpath from root element"""
+        return self._wrap(await self._run(self.element.get_element, xpath))
+
+    async def get_elements(self, xpath) -> list[AsyncElement]:
+        """get list of elements by Xpath from root element"""
+        return [self._wrap(item) for item in await self._run(self.element.get_elements, xpath)]
+
+    async def wait_and_click(self, bef: float | None = None, aft: float = 0,
+                             timeout: float = Element._auto_wait_timeout):
+        """
+        click when element is actionable, or wait sometime before and after click
+        """
+        if bef is None:
+            await self._run(self.element.wait_and_click, None, 0, timeout)
+        else:
+            await asyncio.sleep(bef)
+            await self._run(self.element.click)
+        await asyncio.sleep(aft)
+
+    async def wait(self, wait_time: float = 0.5) -> AsyncElement:
+        """
+            builder pattern for wait
+        """
+        await asyncio.sleep(wait_time)
+        return self
+
+
+class AsyncDriver(_AsyncProxy):
+    def __init__(self, driver: Driver, runner: AsyncRunner = default_runner):
+        """
+        :param driver: Driver to control
+        :param runner: thread pool shared by drivers, it limits the number of concurrent WebDriver calls
+        """
+        super().__init__(driver, runner)
+        self.driver = driver
+
+    @classmethod
+    async def set_chrome(cls, runner: AsyncRunner = default_runner, driver_cls: type[Driver] = Driver, **kwargs):
+        """
+        launch chrome in thread pool
+        :param runner: thread pool to run WebDriver calls
+        :param driver_cls: Driver class
+        :param kwargs: arguments for Driver.set_chrome
+        :return: AsyncDriver
+        """
+        return cls(await runner.run(driver_cls.set_chrome, **kwargs), runner)
+
+    async def wait_presence(self, xpath: str, wait_time: int = Driver._default_wait_time,
+                            message: str | None = None) -> AsyncElement:
+        """shortcut to wait for element to presence in DOM"""
+        return self._wrap(await self._run(self.driver.wait_presence, xpath, wait_time, message))
+
+    async def wait_visible(self, xpath: str, wait_time: int = Driver._default_wait_time,
+                           message: str | None = None) -> AsyncElement:
+        """wait element to be visible"""
+        return self._wrap(await self._run(self.driver.wait_visible, xpath, wait_time, message))
+
+    async def wait_invisible(self, xpath: str, wait_time: int = Driver._default_wait_time,
+                             message: str | None = None) -> AsyncElement:
+        """wait element to be invisible"""
+        return self._wrap(await self._run(self.driver.wait_invisible, xpath, wait_time, message))
+
+    async def wait_clickable(self, xpath: str, wait_time: int = Driver._default_wait_time,
+                             message: str | None = None) -> AsyncElement:
+        """wait element to be clickable"""
+        return self._wrap(await self._run(self.driver.wait_clickable, xpath, wait_time, message))
+
+    async def get_element(self, xpath) -> AsyncElement:
+        """shortcut for get element by Xpath"""
+        return self._wrap(await self._run(self.driver.get_element, xpath))
+
+    async def get_elements(self, xpath) -> list[AsyncElement]:
+        """shortcut for get list of elements by Xpath"""
+        return [self._wrap(item) for item in await self._run(self.driver.get_elements, xpath)]
+
+    async def remove_element_by_xpath(self, xpath, delay_before: float | None = None,
+                                      delay_after: float | None = None, timeout: float = 0):
+        """
+        remove element from DOM by xpath if it is present, wait up to timeout for it, or with fixed delays
+        """
+        if delay_before is not None:
+            await asyncio.sleep(delay_before)
+        await self._run(self.driver.remove_element_by_xpath, xpath, None, None, timeout)
+        if delay_after is not None:
+            await asyncio.sleep(delay_after)
+
+    async def quit(self):
+        await self._run(self.driver.quit)
@@ -0,0 +1,51 @@
+"""
+    This module helps to block resources by CDP Network.setBlockedURLs
+    - resource types are mapped to url patterns of their file extensions
+    - BlockedCounter counts requests blocked in a session, from performance log events
+"""
+
+from __future__ import annotations
+
+RESOURCE_PATTERNS = {
+    'image': ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp", "*.avif"],
+    'font': ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    'media': ["*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav", "*.m4a", "*.mov", "*.avi", "*.m3u8"],
+    'stylesheet': ["*.css"],
+}
+
+
+def blocked_url_patterns(block_resources: list[str] | None = None, block_urls: list[str] | None = None) -> list[str]:
+    """
+    :param block_resources: resource types, key of RESOURCE_PATTERNS
+    :param block_urls: url patterns, * is wildcard
+    :return: url patterns for Network.setBlockedURLs
+    """
+    patterns = []
+    for resource in block_resources or []:
+        if resource not in RESOURCE_PATTERNS:
+            raise ValueError(f"Invalid resource type to block: {resource}, expected: {list(RESOURCE_PATTERNS.keys())}")
+        for pattern in RESOURCE_PATTERNS[resource]:
+            # match also urls with query string
+            patterns.extend([pattern, pattern + "?*"])
+    patterns.extend(block_urls or [])
+    return patterns
+
+
+class BlockedCounter:
+    def __init__(self):
+        self.total = 0
+        self.by_type = {}
+
+    def __call__(self, events: list[dict]):
+        for event in events:
+            if event.get("method") != "Network.loadingFailed":
+                continue
+            params = event.get("params", {})
+            if params.get("blockedReason") != "inspector":
+                continue
+            resource_type = params.get("type", "Other")
+            self.total += 1
+            self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+
+    def as_dict(self) -> dict:
+        return {"total": self.total, "by_type": dict(self.by_type)}
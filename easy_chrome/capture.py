@@ -0,0 +1,188 @@
+"""
+    This module captures XHR / fetch responses from CDP Network events of the performance log
+    - responses are matched by url patterns (* is wildcard) and resource types
+    - body is read by Network.getResponseBody as soon as loading is finished, before the page can drop it
+    - completed responses are kept in a bounded buffer, oldest are dropped when it is full
+    - with a callback, a background thread reads the log every poll_interval and nothing is buffered
+        eg:
+            driver = Driver.set_chrome(performance_log=True)
+            capture = driver.capture_responses(["*/api/items*"])
+            driver.get(url)
+            for response in capture.iter(timeout=10):
+                print(response.url, response.json())
+            capture.stop()
+
+            capture = driver.capture_responses(["*/api/items*"], callback=lambda response: save(response.json()))
+            ...
+            capture.stop()
+"""
+
+from __future__ import annotations
+import base64
+import json
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from time import monotonic, sleep
+from typing import Callable, Iterator
+
+from selenium.common.exceptions import WebDriverException
+
+
+@dataclass
+class CapturedResponse:
+    url: str
+    status: int
+    mime_type: str
+    resource_type: str
+    request_id: str
+    body: str | bytes | None = None
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class ResponseCapture:
+    def __init__(self,
+                 driver,
+                 patterns: list[str] | None = None,
+                 resource_types: tuple[str, ...] = ("XHR", "Fetch"),
+                 max_buffer: int = 1000,
+                 callback: Callable[[CapturedResponse], None] | None = None,
+                 poll_interval: float = 0.1):
+        """
+        :param driver: Driver with performance log enabled
+        :param patterns: url patterns, * is wildcard, default all urls
+        :param resource_types: CDP resource types to capture, None for all
+        :param max_buffer: max completed responses kept, also max responses waiting for body
+        :param callback: function(response), called for every captured response, instead of buffering it,
+            from a background thread which reads the log every poll_interval until stop()
+        :param poll_interval: seconds between reads of the log by the background thread of callback mode
+        """
+        self.driver = driver
+        self.patterns = patterns or ["*"]
+        self.resource_types = resource_types
+        self.max_buffer = max_buffer
+        self.callback = callback
+        self.buffer = deque(maxlen=max_buffer)
+        self.dropped = 0
+        self.failed = 0
+        self._pending = OrderedDict()
+        self.poll_interval = poll_interval
+        self.error = None
+        self._running = False
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _match(self, url: str, resource_type: str) -> bool:
+        if self.resource_types and resource_type not in self.resource_types:
+            return False
+        return any(fnmatchcase(url, pattern) for pattern in self.patterns)
+
+    def _read_body(self, response: CapturedResponse):
+        try:
+            result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": response.request_id})
+        except WebDriverException:
+            # body is evicted, or request is from another tab
+            self.failed += 1
+            return False
+        body = result.get("body")
+        response.body = base64.b64decode(body) if result.get("base64Encoded") else body
+        return True
+
+    def _deliver(self, response: CapturedResponse):
+        if self.callback is not None:
+            self.callback(response)
+            return
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append(response)
+
+    def __call__(self, events: list[dict]):
+        for event in events:
+            method, params = event.get("method"), event.get("params", {})
+            if method == "Network.responseReceived":
+                response = params.get("response", {})
+                if not self._match(response.get("url", ""), params.get("type", "")):
+                    continue
+                self._pending[params["requestId"]] = CapturedResponse(url=response.get("url"),
+                                                                      status=response.get("status"),
+                                                                      mime_type=response.get("mimeType"),
+                                                                      resource_type=params.get("type"),
+                                                                      request_id=params["requestId"])
+                if len(self._pending) > self.max_buffer:
+                    self._pending.popitem(last=False)
+                    self.dropped += 1
+            elif method == "Network.loadingFinished":
+                response = self._pending.pop(params.get("requestId"), None)
+                if response is not None and self._read_body(response):
+                    self._deliver(response)
+            elif method == "Network.loadingFailed":
+                self._pending.pop(params.get("requestId"), None)
+
+    def start(self) -> ResponseCapture:
+        if not self._running:
+            self.driver.performance_log.subscribe(self)
+            self._running = True
+            if self.callback is not None:
+                self._stop_event.clear()
+                self._thread = threading.Thread(target=self._poll_loop, name="easy_chrome-capture", daemon=True)
+                self._thread.start()
+        return self
+
+    def _poll_loop(self):
+        # drain the log while nobody polls it, else chromedriver buffers every event until the next poll
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.driver.performance_log.poll()
+            except Exception as e:
+                # driver is gone or callback raised, kept for the caller
+                self.error = e
+                return
+
+    def stop(self):
+        if self._running:
+            self._stop_event.set()
+            if self._thread is not None and self._thread is not threading.current_thread():
+                self._thread.join()
+            self._thread = None
+            self.driver.performance_log.unsubscribe(self)
+            self._running = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def poll(self) -> list[CapturedResponse]:
+        """
+        read new events, then pop all buffered responses
+        """
+        self.driver.performance_log.poll()
+        responses = list(self.buffer)
+        self.buffer.clear()
+        return responses
+
+    def iter(self, timeout: float | None = None, idle_timeout: float | None = None,
+             poll_interval: float = 0.1) -> Iterator[CapturedResponse]:
+        """
+        stream captured responses
+        :param timeout: stop after this number of seconds, None for no limit
+        :param idle_timeout: stop when no response is captured for this number of seconds
+        :param poll_interval: seconds between reads of performance log
+        """
+        start = last = monotonic()
+        while True:
+            responses = self.poll()
+            if responses:
+                last = monotonic()
+            yield from responses
+
+            now = monotonic()
+            if timeout is not None and now - start >= timeout:
+                return
+            if idle_timeout is not None and now - last >= idle_timeout:
+                return
+            sleep(poll_interval)
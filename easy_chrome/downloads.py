@@ -0,0 +1,215 @@
+"""
+    This module tracks downloads by CDP download events of the performance log
+    - Browser.setDownloadBehavior saves files by guid, so parallel downloads with the same name do not clash,
+      completed files are renamed to their suggested name
+    - expect_download: catch the next download started inside the block, or within begin_timeout after it
+        eg:
+            driver = Driver.set_chrome(download_dir="downloads", performance_log=True)
+            with driver.expect_download() as download:
+                driver.get_element(button_xpath).click()
+            print(download.result(timeout=60).path)
+"""
+
+from __future__ import annotations
+import os
+from dataclasses import dataclass
+from time import monotonic, sleep, time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+
+@dataclass
+class Download:
+    guid: str
+    url: str
+    filename: str
+    path: str | None = None
+    total_bytes: int = 0
+    received_bytes: int = 0
+    state: str = "inProgress"
+    started: float | None = None
+    finished: float | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.state in ("completed", "canceled")
+
+    @property
+    def duration(self) -> float | None:
+        """seconds from start to end"""
+        if self.started is None or self.finished is None:
+            return None
+        return (self.finished - self.started) / 1000
+
+    @property
+    def throughput(self) -> float | None:
+        """bytes per second"""
+        duration = self.duration
+        if not duration:
+            return None
+        return self.received_bytes / duration
+
+    @property
+    def size(self) -> int:
+        return self.received_bytes
+
+
+class ExpectedDownload:
+    def __init__(self, tracker: DownloadTracker, begin_timeout: float = 10):
+        """
+        :param tracker: DownloadTracker
+        :param begin_timeout: seconds after the with block for the download to begin, else it is not expected anymore
+        """
+        self.tracker = tracker
+        self.begin_timeout = begin_timeout
+        self.download = None
+        # epoch milliseconds, same clock as timestamps of performance log events
+        self.entered = None
+        self.exited = None
+
+    def __enter__(self):
+        # downloads which began before the block must not be bound to it
+        self.tracker.poll()
+        self.entered = time() * 1000
+        self.tracker._expectations.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.exited = time() * 1000
+        if exc_type is not None:
+            self._discard()
+
+    def _discard(self):
+        if self in self.tracker._expectations:
+            self.tracker._expectations.remove(self)
+
+    def expired(self, timestamp: float | None = None) -> bool:
+        """:return: True if no download can begin for this block anymore, at timestamp in epoch milliseconds"""
+        if self.exited is None:
+            return False
+        return (time() * 1000 if timestamp is None else timestamp) > self.exited + self.begin_timeout * 1000
+
+    def result(self, timeout: float = 60, poll_interval: float = 0.1) -> Download:
+        """
+        wait until the download is completed
+        :return: Download with path, size, duration, throughput; raise TimeoutException or WebDriverException
+        """
+        deadline = monotonic() + timeout
+        while True:
+            self.tracker.poll()
+            if self.download is not None and self.download.done:
+                if self.download.state == "canceled":
+                    raise WebDriverException(f"download canceled: {self.download.url}")
+                return self.download
+            if self.download is None and self.expired():
+                self._discard()
+                raise TimeoutException(f"no download began within {self.begin_timeout}s after the with block")
+            if monotonic() > deadline:
+                raise TimeoutException(f"download is not completed after {timeout}s")
+            sleep(poll_interval)
+
+
+class DownloadTracker:
+    def __init__(self, driver, download_dir: str):
+        """
+        :param driver: Driver with performance log enabled
+        :param download_dir: directory to save files
+        """
+        self.driver = driver
+        self.download_dir = os.path.abspath(download_dir)
+        self.downloads = {}
+        self._expectations = []
+
+    def start(self) -> DownloadTracker:
+        os.makedirs(self.download_dir, exist_ok=True)
+        self.set_behavior()
+        self.driver.performance_log.subscribe(self)
+        return self
+
+    def set_behavior(self, browser_context_id: str | None = None):
+        """
+        save downloads of a browser context by guid, with events
+        :param browser_context_id: context created by Target.createBrowserContext, default the default context
+        """
+        params = {"behavior": "allowAndName", "downloadPath": self.download_dir, "eventsEnabled": True}
+        if browser_context_id:
+            params["browserContextId"] = browser_context_id
+        self.driver.execute_cdp_cmd("Browser.setDownloadBehavior", params)
+
+    def stop(self):
+        self.driver.performance_log.unsubscribe(self)
+
+    def poll(self):
+        self.driver.performance_log.poll()
+
+    def _unique_path(self, filename: str) -> str:
+        name, ext = os.path.splitext(os.path.basename(filename) or "download")
+        path = os.path.join(self.download_dir, name + ext)
+        counter = 1
+        while os.path.exists(path):
+            path = os.path.join(self.download_dir, f"{name} ({counter}){ext}")
+            counter += 1
+        return path
+
+    def _finish(self, download: Download):
+        saved = os.path.join(self.download_dir, download.guid)
+        download.path = saved
+        if download.state == "completed" and os.path.exists(saved):
+            download.path = self._unique_path(download.filename)
+            os.replace(saved, download.path)
+
+    def __call__(self, events: list[dict]):
+        # Page.* and Browser.* download events have the same params, handle both
+        for event in events:
+            method, params = event.get("method", ""), event.get("params", {})
+            if method.endswith(".downloadWillBegin"):
+                if params["guid"] in self.downloads:
+                    continue
+                download = Download(guid=params["guid"],
+                                    url=params.get("url"),
+                                    filename=params.get("suggestedFilename", ""),
+                                    started=event.get("timestamp"))
+                self.downloads[download.guid] = download
+                self._bind(download)
+            elif method.endswith(".downloadProgress"):
+                download = self.downloads.get(params.get("guid"))
+                if download is None or download.done:
+                    continue
+                download.total_bytes = params.get("totalBytes", download.total_bytes)
+                download.received_bytes = params.get("receivedBytes", download.received_bytes)
+                download.state = params.get("state", download.state)
+                if download.done:
+                    download.finished = event.get("timestamp")
+                    self._finish(download)
+
+    def _bind(self, download: Download):
+        # expectations are in enter order, drop the ones whose block is over for too long
+        while self._expectations and self._expectations[0].expired(download.started):
+            self._expectations.pop(0)
+        if not self._expectations:
+            return
+        expectation = self._expectations[0]
+        if download.started is not None and download.started < expectation.entered:
+            # began before the oldest block, so before all of them
+            return
+        self._expectations.pop(0).download = download
+
+    def expect(self, begin_timeout: float = 10) -> ExpectedDownload:
+        """
+        :param begin_timeout: seconds after the with block for the download to begin
+        """
+        return ExpectedDownload(self, begin_timeout)
+
+    def wait_all(self, timeout: float = 60, poll_interval: float = 0.1) -> list[Download]:
+        """
+        wait until all started downloads are completed or canceled
+        :return: all downloads
+        """
+        deadline = monotonic() + timeout
+        while True:
+            self.poll()
+            if all(download.done for download in self.downloads.values()):
+                return list(self.downloads.values())
+            if monotonic() > deadline:
+                raise TimeoutException(f"downloads are not completed after {timeout}s")
+            sleep(poll_interval)
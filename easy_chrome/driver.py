@@ -1,21 +1,59 @@
 from __future__ import annotations
-from time import sleep
+from time import sleep, monotonic, perf_counter
+import json
 import os
+import shutil
+import uuid
+from typing import Callable, Iterable, Iterator
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
 
-from .utils import ignore_error, WaitList
+from . import scripts
+from .utils import ignore_error, split_deep_selector, WaitList
+from .blocking import BlockedCounter, blocked_url_patterns
+from .capture import ResponseCapture
+from .downloads import DownloadTracker, ExpectedDownload
 from .element import Element
+from .events import PerformanceLog
+from .metrics import Metrics, find_shortcut
+from .navigation import Navigation, NavigationTracker, OriginTracker, url_origin
+from .profile import CacheCounter, clone_profile
+from .tabs import TabResult, TabScheduler, _target_id
 from .version import driver_path
 
 
 class Driver(webdriver.Chrome):
     _default_wait_time = 30
+    # polling: WebDriverWait find_element every 0.5s, observer: in-page MutationObserver
+    wait_engine = "polling"
+    _observer_slice = 10
+    performance_log_enabled = False
+    _performance_log = None
+    _blocked_counter = None
+    # url patterns of set_blocked_urls, and handles of tabs they are applied to
+    _blocked_patterns = None
+    _blocked_tabs = None
+    # proxy_server:port from set_chrome, reused by http_session
+    proxy = ""
+    download_dir = None
+    _download_tracker = None
+    # browser context of the current tab after reset, None for the default context
+    _browser_context_id = None
+    # per-session clone of profile_template, deleted on quit
+    profile_dir = None
+    _cache_counter = None
+    _origin_tracker = None
+    # latency histograms of WebDriver commands, None when disabled
+    metrics: Metrics | None = None
+    # fields of CDP Network.CookieParam, other fields of Network.Cookie are dropped in export_state
+    _COOKIE_PARAMS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority",
+                      "sourceScheme", "sourcePort", "partitionKey")
 
     @classmethod
     def set_chrome(cls,
@@ -24,7 +62,16 @@ class Driver(webdriver.Chrome):
                    download_dir: str = None,
                    proxy="",
                    other_args: list = None,
-                   other_options: dict = None):
+                   other_options: dict = None,
+                   wait_engine: str = "polling",
+                   performance_log: bool = False,
+                   state: dict | str | None = None,
+                   page_load_strategy: str | None = None,
+                   block_resources: list[str] | None = None,
+                   block_urls: list[str] | None = None,
+                   incognito: bool = True,
+                   profile_template: str | None = None,
+                   profile_clone_mode: str = "auto"):
         """
         :param detach_mode: chrome detach mode, default False
         :param headless: run in headless mode or not, default False
@@ -32,6 +79,19 @@ class Driver(webdriver.Chrome):
         :param proxy: proxy_server:port
         :param other_args: other arguments to add to chrome options
         :param other_options: other experimental options to add to chrome options
+        :param wait_engine: engine for wait_presence, wait_visible, wait_invisible, wait_clickable
+            - polling: WebDriverWait, poll every 0.5s
+            - observer: resolve as soon as DOM changes, fall back to polling on navigation or timeout
+        :param performance_log: enable chrome performance log, which contains DevTools Page and Network events
+        :param state: snapshot from export_state, restored after chrome is started, eg: to skip login flow
+        :param page_load_strategy: normal, eager (DOMContentLoaded) or none, default normal
+        :param block_resources: resource types to block: image, font, media, stylesheet
+        :param block_urls: url patterns to block, * is wildcard, eg: *google-analytics.com*
+            blocked requests are counted only with performance_log, see blocked_requests
+        :param incognito: start chrome in incognito mode, default True
+        :param profile_template: profile built by build_profile_template, cloned for this session and deleted on quit,
+            disables incognito so the HTTP cache of the template is used, see cache_stats
+        :param profile_clone_mode: auto, reflink or copy, see clone_profile
         :return: Chrome WebDriver
         """
         chrome_options = webdriver.ChromeOptions()
@@ -51,7 +111,13 @@ class Driver(webdriver.Chrome):
         chrome_options.add_experimental_option("detach", detach_mode)
 
         # add default argument
-        chrome_options.add_argument("--incognito")
+        # incognito has an in-memory cache, a profile template needs a normal session
+        profile_dir = None
+        if profile_template:
+            profile_dir = clone_profile(profile_template, mode=profile_clone_mode)
+            chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+        elif incognito:
+            chrome_options.add_argument("--incognito")
         chrome_options.add_argument('--disable-infobars')
         chrome_options.add_argument('--start-maximized')
         chrome_options.add_argument('--ignore-certificate-errors')
@@ -60,14 +126,31 @@ class Driver(webdriver.Chrome):
         chrome_options.add_argument("--disable-features=DownloadBubble,DownloadBubbleV2")
 
         # add download directory
+        prefs = {}
         if download_dir is not None:
-            prefs = {"download.default_directory": os.path.abspath(download_dir)}
+            prefs["download.default_directory"] = os.path.abspath(download_dir)
+
+        # images without known extension are blocked by content setting
+        if block_resources and "image" in block_resources:
+            prefs["profile.managed_default_content_settings.images"] = 2
+
+        if prefs:
             chrome_options.add_experimental_option("prefs", prefs)
 
+        if page_load_strategy:
+            chrome_options.page_load_strategy = page_load_strategy
+
         # add proxy server
         if ":" in str(proxy):
             chrome_options.add_argument('--proxy-server=http://{}'.format(proxy))
 
+        # raise on invalid resource type before chrome is started
+        blocked_patterns = blocked_url_patterns(block_resources, block_urls)
+
+        # enable DevTools events in performance log
+        if performance_log:
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
         # add user arguments
         if other_args:
             for arg in other_args:
@@ -78,11 +161,101 @@ class Driver(webdriver.Chrome):
             for k, v in other_options.items():
                 chrome_options.add_experimental_option(name=k, value=v)
 
-        return cls(service=Service(driver_path.path), options=chrome_options)
+        if wait_engine not in ("polling", "observer"):
+            raise ValueError(f"Invalid wait_engine: {wait_engine}, expected: ['polling', 'observer']")
+
+        try:
+            driver = cls(service=Service(driver_path.path), options=chrome_options)
+        except Exception:
+            if profile_dir:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+        driver.profile_dir = profile_dir
+        driver.wait_engine = wait_engine
+        driver.performance_log_enabled = performance_log
+        driver.proxy = proxy if ":" in str(proxy) else ""
+        driver.download_dir = download_dir
+        if blocked_patterns:
+            driver.set_blocked_urls(blocked_patterns)
+        if profile_dir and performance_log:
+            driver._cache_counter = CacheCounter()
+            driver.performance_log.subscribe(driver._cache_counter)
+        if performance_log:
+            driver._origin_tracker = OriginTracker()
+            driver.performance_log.subscribe(driver._origin_tracker)
+        if state:
+            driver.import_state(state)
+        return driver
+
+    def execute(self, driver_command, params=None):
+        response = self._execute_timed(driver_command, params)
+        # CDP blocking is per tab, apply it to other tabs when they are switched to
+        if self._blocked_tabs is not None and driver_command == Command.SWITCH_TO_WINDOW and params:
+            self._block_tab(params.get("handle"))
+        return response
+
+    def _execute_timed(self, driver_command, params=None):
+        if self.metrics is None:
+            return super().execute(driver_command, params)
+
+        command = driver_command
+        if driver_command == "executeCdpCommand" and params:
+            command = f"{driver_command}:{params.get('cmd')}"
+        start = perf_counter()
+        error = False
+        try:
+            return super().execute(driver_command, params)
+        except Exception:
+            error = True
+            raise
+        finally:
+            # skip _execute_timed and execute, else every command is attributed to Driver.execute
+            self.metrics.record(command, find_shortcut(depth=3), perf_counter() - start, error)
+
+    def enable_metrics(self, metrics: Metrics | None = None) -> Metrics:
+        """
+        time every WebDriver command, with the easy_chrome shortcut which issued it
+        :param metrics: Metrics to record to, eg: shared by many drivers, default a new one
+        :return: Metrics
+        """
+        self.metrics = metrics or Metrics()
+        return self.metrics
+
+    def disable_metrics(self) -> Metrics | None:
+        """
+        :return: recorded Metrics
+        """
+        metrics, self.metrics = self.metrics, None
+        return metrics
 
     def _wait(self, wait_time=_default_wait_time):
         return WebDriverWait(self, wait_time)
 
+    @staticmethod
+    def _as_element(result, xpath: str | None = None):
+        return Element(result, xpath) if isinstance(result, WebElement) else result
+
+    def _wait_xpath(self, condition: str, xpath: str, wait_time: float, message: str):
+        """
+        wait element located by xpath to match condition (presence, visible, invisible, clickable)
+        observer engine waits in page by slices, polling handles the remaining time
+        """
+        deadline = monotonic() + wait_time
+        if self.wait_engine == "observer":
+            while (remaining := deadline - monotonic()) > 0:
+                try:
+                    result = self.execute_async_script(scripts.WAIT_XPATH, xpath, condition,
+                                                       int(min(remaining, self._observer_slice) * 1000))
+                except WebDriverException:
+                    # page navigated or script timeout, let polling handle the rest
+                    break
+                if result:
+                    return self._as_element(result, xpath)
+
+        result = self._wait(max(deadline - monotonic(), 0)).until(
+            WaitList.ELE_SELECTOR[condition]((By.XPATH, xpath)), message=message)
+        return self._as_element(result, xpath)
+
     def wait_presence(self, xpath: str, wait_time: int = _default_wait_time, message: str | None = None) -> Element:
         """
         shortcut to wait for element to presence in DOM
@@ -92,8 +265,7 @@ class Driver(webdriver.Chrome):
         :return: element as custom Element
         """
 
-        return Element(self._wait(wait_time).until(EC.presence_of_element_located((By.XPATH, xpath)),
-                                                   message=message or f"wait_presence, xpath: {xpath}"))
+        return self._wait_xpath("presence", xpath, wait_time, message or f"wait_presence, xpath: {xpath}")
 
     def wait_visible(self, xpath: str, wait_time: int = _default_wait_time, message: str | None = None) -> Element:
         """wait element to be visible
@@ -102,8 +274,7 @@ class Driver(webdriver.Chrome):
         :param message: message for exception
         :return: element as custom Element
         """
-        return Element(self._wait(wait_time).until(EC.visibility_of_element_located((By.XPATH, xpath)),
-                                                   message=message or f"wait_visible, xpath: {xpath}"))
+        return self._wait_xpath("visible", xpath, wait_time, message or f"wait_visible, xpath: {xpath}")
 
     def wait_invisible(self, xpath: str, wait_time: int = _default_wait_time, message: str | None = None) -> Element:
         """
@@ -114,8 +285,7 @@ class Driver(webdriver.Chrome):
         :return: element as custom Element
         """
 
-        return Element(self._wait(wait_time).until(EC.invisibility_of_element_located((By.XPATH, xpath)),
-                                                   message=message or f"wait_invisible, xpath: {xpath}"))
+        return self._wait_xpath("invisible", xpath, wait_time, message or f"wait_invisible, xpath: {xpath}")
 
     def wait_clickable(self, xpath: str, wait_time: int = _default_wait_time, message: str | None = None) -> Element:
         """wait element to be clickable
@@ -124,8 +294,7 @@ class Driver(webdriver.Chrome):
         :param message: message for exception
         :return: element as custom Element
         """
-        return Element(self._wait(wait_time).until(EC.element_to_be_clickable((By.XPATH, xpath)),
-                                                   message=message or f"wait_clickable, xpath: {xpath}"))
+        return self._wait_xpath("clickable", xpath, wait_time, message or f"wait_clickable, xpath: {xpath}")
 
     def wait_any_of(self,
                     user_wait_list: list | None = None,
@@ -133,18 +302,19 @@ class Driver(webdriver.Chrome):
                     wait_time: int = _default_wait_time,
                     wait_info: dict[str, str | list] = None):
         """
-        wait all conditions to be true
+        wait any of the conditions to be true
         :param user_wait_list: predefined ExpectedCondition list
         :param timeout_message: message to show when timeout
         :param wait_time: wait time
         :param wait_info: key, pair values to generate ExpectedCondition,
             - url_to_be, url_contains, url_matches, url_changes,
             - presence, visible, invisible, clickable
-        :return: True if ok, else raise TimeOutError with timeout_message
+        :return: list with the first matched condition if ok, else raise TimeOutError with timeout_message:
+            result of a user_wait_list condition (eg: element), or (key, value) of wait_info
         """
         wait_info = wait_info or {}
-        wait_list = WaitList.generate_wait_list(user_wait_list, **wait_info)
-        self._wait(wait_time).until(EC.any_of(*wait_list), message=timeout_message)
+        condition = WaitList.generate_combined("any", user_wait_list, **wait_info)
+        return self._wait(wait_time).until(condition, message=timeout_message)
 
     def wait_all_of(self,
                     user_wait_list: list | None = None,
@@ -159,11 +329,13 @@ class Driver(webdriver.Chrome):
         :param wait_info: dict of key, pair values to generate ExpectedCondition, key in
             - url_to_be, url_contains, url_matches, url_changes,
             - presence, visible, invisible, clickable
-        :return: True if ok, else raise TimeOutError with timeout_message
+        :return: list of results if ok, else raise TimeOutError with timeout_message:
+            results of user_wait_list conditions first, in the same order, like selenium all_of (eg: element),
+            then (key, value) of wait_info, eg: [element, ("url_contains", "/home")]
         """
         wait_info = wait_info or {}
-        wait_list = WaitList.generate_wait_list(user_wait_list, **wait_info)
-        return self._wait(wait_time).until(EC.all_of(*wait_list), message=timeout_message)
+        condition = WaitList.generate_combined("all", user_wait_list, **wait_info)
+        return self._wait(wait_time).until(condition, message=timeout_message)
 
     def wait_none_of(self,
                      user_wait_list: list | None = None,
@@ -181,12 +353,12 @@ class Driver(webdriver.Chrome):
         :return: True if ok, else raise TimeOutError with timeout_message
         """
         wait_info = wait_info or {}
-        wait_list = WaitList.generate_wait_list(user_wait_list, **wait_info)
-        return self._wait(wait_time).until(EC.none_of(*wait_list), message=timeout_message)
+        condition = WaitList.generate_combined("none", user_wait_list, **wait_info)
+        return self._wait(wait_time).until(condition, message=timeout_message)
 
     def get_element(self, xpath) -> Element:
         """shortcut for get element by Xpath"""
-        return Element(self.find_element(by=By.XPATH, value=xpath))
+        return Element(self.find_element(by=By.XPATH, value=xpath), xpath)
 
     def get_elements(self, xpath) -> list[Element]:
         """shortcut for get list of elements by Xpath"""
@@ -200,6 +372,83 @@ class Driver(webdriver.Chrome):
         """get list of elements by Xpath"""
         return self.get_elements(xpath)
 
+    def extract(self,
+                xpath: str,
+                fields: dict[str, str] | list[str] | None = None,
+                root: WebElement | None = None) -> list:
+        """
+        read fields of all elements located by xpath in one execute_script call
+        :param xpath: xpath of elements
+        :param fields: name -> spec, or list of spec (spec is used as name), spec can be
+            - text: rendered text of element
+            - @attr: attribute of element, eg: @href
+            - .//xpath: string value of relative xpath, eg: ./td[2] or ./a/@href
+            - other: property of element, eg: value, textContent, innerHTML
+        :param root: element to evaluate xpath from, default is document
+        :return: list of text if fields is None, else list of dict
+        """
+        if isinstance(fields, list):
+            fields = {spec: spec for spec in fields}
+        return self.execute_script(scripts.EXTRACT, xpath, fields, root)
+
+    def iter_elements(self,
+                      xpath: str,
+                      scroll: bool = True,
+                      next_xpath: str | None = None,
+                      fields: dict[str, str] | list[str] | None = None,
+                      remove: bool = False,
+                      idle_time: float = 3,
+                      max_items: int | None = None,
+                      batch_size: int = 100,
+                      poll_interval: float = 0.2) -> Iterator[Element | dict]:
+        """
+        yield elements of an infinite scroll or paginated list as they appear, each element once
+        :param xpath: xpath of list items
+        :param scroll: scroll to the end of the list when all items are yielded
+        :param next_xpath: xpath of a "next" button, clicked once when all items are yielded
+        :param fields: read fields in page and yield dict, see extract, default yield Element
+        :param remove: remove yielded items from DOM when the next batch is requested,
+            keeps page memory flat, an Element must not be used after the next one is yielded
+        :param idle_time: stop when no new item appears for this number of seconds
+        :param max_items: stop after this number of items
+        :param batch_size: max items read per execute_script
+        :param poll_interval: seconds between checks for new items
+        """
+        if isinstance(fields, list):
+            fields = {spec: spec for spec in fields}
+        key = uuid.uuid4().hex
+        count = 0
+        idle_since = None
+        advanced = False
+        try:
+            while max_items is None or count < max_items:
+                limit = batch_size if max_items is None else min(batch_size, max_items - count)
+                try:
+                    batch = self.execute_script(scripts.ITER_ELEMENTS, xpath, key, limit, fields,
+                                                remove, scroll, next_xpath if idle_since is None else None)
+                except WebDriverException:
+                    # page may be unloading after scroll or next click
+                    if not advanced:
+                        raise
+                    batch = {"items": [], "advanced": False}
+
+                if batch["items"]:
+                    idle_since, advanced = None, False
+                    for item in batch["items"]:
+                        count += 1
+                        yield item if fields is not None else Element(item)
+                    continue
+
+                advanced = advanced or batch["advanced"]
+                if idle_since is None:
+                    idle_since = monotonic()
+                elif monotonic() - idle_since > idle_time:
+                    return
+                sleep(poll_interval)
+        finally:
+            ignore_error(self.execute_script)(
+                "if (window.__easyChromeIter) delete window.__easyChromeIter[arguments[0]];", key)
+
     def get_session_storage(self, key):
         """
         :param key: session storage key to get
@@ -247,6 +496,53 @@ class Driver(webdriver.Chrome):
         cookies_string = '; '.join(['{}={}'.format(cookie['name'], cookie['value']) for cookie in cookies])
         return cookies_string
 
+    def export_state(self) -> dict:
+        """
+        snapshot cookies of all domains and storage of current origin, in 2 calls
+        :return: json serializable dict, use it with import_state or set_chrome(state=...)
+        """
+        storage = self.execute_script(scripts.EXPORT_STORAGE)
+        cookies = self.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        for cookie in cookies:
+            # session cookie has expires -1, which must not be sent back
+            if cookie.get("session"):
+                cookie.pop("expires", None)
+        return {"origin": storage["origin"],
+                "cookies": [{k: v for k, v in cookie.items() if k in self._COOKIE_PARAMS} for cookie in cookies],
+                "local_storage": storage["local"],
+                "session_storage": storage["session"]}
+
+    def import_state(self, state: dict | str, navigate: bool = True):
+        """
+        restore a snapshot from export_state: cookies by one CDP call, storage by one execute_script
+        :param state: dict from export_state, or its json string
+        :param navigate: open state origin first if current page is on another origin, else storage is skipped
+        """
+        if isinstance(state, str):
+            state = json.loads(state)
+
+        if state.get("cookies"):
+            self.execute_cdp_cmd("Network.setCookies", {"cookies": state["cookies"]})
+
+        if not (state.get("local_storage") or state.get("session_storage")):
+            return
+        if self.execute_script("return window.location.origin;") != state["origin"]:
+            if not navigate:
+                return
+            self.get(state["origin"])
+        self.execute_script(scripts.IMPORT_STORAGE, state.get("local_storage", {}), state.get("session_storage", {}))
+
+    def http_session(self, pool_size: int = 10, check_interval: float = 1.0):
+        """
+        requests Session with user agent, proxy and cookies of this driver, see BrowserSession
+        :param pool_size: max keep-alive connections per host
+        :param check_interval: min seconds between checks of browser cookies
+        :return: BrowserSession
+        """
+        from .http_session import BrowserSession
+
+        return BrowserSession(self, pool_size=pool_size, check_interval=check_interval)
+
     def get_user_agent(self):
         """
         :return: get current driver user agent
@@ -260,6 +556,28 @@ class Driver(webdriver.Chrome):
         """
         return self.execute_script('return arguments[0].shadowRoot', element)
 
+    def get_deep(self, selector: str, cache: bool = False, root: WebElement | None = None) -> Element:
+        """
+        get element across shadow roots in one call
+        :param selector: css selectors joined by >>>, each >>> enters shadow root of matched hosts,
+            eg: "my-app >>> settings-panel >>> button.save"
+        :param cache: keep resolved shadow roots in page, they are dropped on any DOM mutation
+        :param root: element to query from, default is document
+        :return: first matched element as custom Element, raise NoSuchElementException if not found
+        """
+        element = self.execute_script(scripts.QUERY_DEEP, split_deep_selector(selector), False, cache, root)
+        if element is None:
+            raise NoSuchElementException(f"get_deep, selector: {selector}")
+        return Element(element)
+
+    def get_all_deep(self, selector: str, cache: bool = False, root: WebElement | None = None) -> list[Element]:
+        """
+        get all elements across shadow roots in one call, see get_deep
+        :return: list of custom Element
+        """
+        return [Element(item) for item in
+                self.execute_script(scripts.QUERY_DEEP, split_deep_selector(selector), True, cache, root)]
+
     @property
     def user_agent(self):
         """
@@ -271,17 +589,260 @@ class Driver(webdriver.Chrome):
     def is_ready(self):
         return self.execute_script("return document.readyState") == "complete"
 
-    def wait_redirected(self, limit_redirect=4, limit_time=20):
+    @property
+    def performance_log(self) -> PerformanceLog:
         """
-        sometime page is continuously redirected, this function will wait for some completed redirection
+        :return: reader of DevTools events, shared by all trackers of this driver
+        """
+        if self._performance_log is None:
+            self._performance_log = PerformanceLog(self)
+        return self._performance_log
+
+    def set_blocked_urls(self, patterns: list[str]):
+        """
+        block requests matching url patterns in all tabs, by CDP Network.setBlockedURLs
+        patterns are applied to the current tab now, and to other tabs when they are switched to
+        :param patterns: url patterns, * is wildcard, see blocking.blocked_url_patterns for resource types
+        """
+        self._blocked_patterns = list(patterns)
+        self._blocked_tabs = set()
+        self._block_tab(self.current_window_handle)
+        if self._blocked_counter is None and self.performance_log_enabled:
+            self._blocked_counter = BlockedCounter()
+            self.performance_log.subscribe(self._blocked_counter)
+
+    def _block_tab(self, handle: str):
+        if handle in self._blocked_tabs:
+            return
+        self.execute_cdp_cmd("Network.enable", {})
+        self.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self._blocked_patterns})
+        self._blocked_tabs.add(handle)
+
+    @property
+    def blocked_urls(self) -> list[str]:
+        """
+        :return: url patterns blocked by set_blocked_urls
+        """
+        return list(self._blocked_patterns or [])
+
+    @property
+    def blocked_requests(self) -> dict:
+        """
+        :return: number of blocked requests, total and by resource type, needs set_chrome(performance_log=True)
+        """
+        if self._blocked_counter is None:
+            return {"total": 0, "by_type": {}}
+        self.performance_log.poll()
+        return self._blocked_counter.as_dict()
+
+    @property
+    def cache_stats(self) -> dict:
+        """
+        :return: responses, from_cache and hit_ratio since start, needs profile_template and performance log
+        """
+        if self._cache_counter is None:
+            return {"responses": 0, "from_cache": 0, "hit_ratio": 0.0}
+        self.performance_log.poll()
+        return self._cache_counter.as_dict()
+
+    def quit(self):
+        try:
+            super().quit()
+        finally:
+            # delete the clone of profile_template after chrome released it
+            if self.profile_dir:
+                shutil.rmtree(self.profile_dir, ignore_errors=True)
+                self.profile_dir = None
+
+    def capture_responses(self,
+                          patterns: list[str] | None = None,
+                          resource_types: tuple[str, ...] | None = ("XHR", "Fetch"),
+                          max_buffer: int = 1000,
+                          callback: Callable | None = None,
+                          poll_interval: float = 0.1) -> ResponseCapture:
+        """
+        capture bodies of responses matching url patterns, from DevTools Network events, see ResponseCapture
+        :param patterns: url patterns, * is wildcard, default all urls
+        :param resource_types: CDP resource types to capture, None for all
+        :param max_buffer: max responses kept in memory, oldest are dropped
+        :param callback: function(response), called for every captured response, instead of buffering it,
+            from a background thread which reads the log every poll_interval until stop()
+        :param poll_interval: seconds between reads of the log in callback mode
+        :return: started ResponseCapture, read it by iter() or poll(), stop it by stop()
+        """
+        if not self.performance_log_enabled:
+            raise ValueError("capture_responses needs performance log, use set_chrome(performance_log=True)")
+        return ResponseCapture(self, patterns, resource_types, max_buffer, callback, poll_interval).start()
+
+    @property
+    def downloads(self) -> DownloadTracker:
+        """
+        :return: tracker of downloads by DevTools events, enabled on first access, needs performance log
+        """
+        if self._download_tracker is None:
+            if not self.performance_log_enabled:
+                raise ValueError("download tracking needs performance log, use set_chrome(performance_log=True)")
+            self._download_tracker = DownloadTracker(self, self.download_dir or os.getcwd()).start()
+        return self._download_tracker
+
+    def expect_download(self, begin_timeout: float = 10) -> ExpectedDownload:
+        """
+        catch the next download started inside the with block
+            with driver.expect_download() as download:
+                button.click()
+            download.result(timeout=60)  # Download with path, size, duration, throughput
+        :param begin_timeout: seconds after the with block for the download to begin, eg: click returns before it
+        """
+        return self.downloads.expect(begin_timeout)
+
+    def iter_tabs(self,
+                  urls: Iterable[str],
+                  handler: Callable | None = None,
+                  max_tabs: int = 5,
+                  page_timeout: float = 30) -> Iterator[TabResult]:
+        """
+        load urls in parallel tabs of this driver, see TabScheduler
+        :param urls: urls to load
+        :param handler: function(driver) -> value, called in the loaded tab, default returns page_source
+        :param max_tabs: max tabs loading at the same time
+        :param page_timeout: seconds before a page is reported as TimeoutException
+        :return: iterator of TabResult (url, value, error, duration), in completion order
+        """
+        return TabScheduler(self, handler, max_tabs=max_tabs, page_timeout=page_timeout).run(urls)
+
+    def wait_redirected(self,
+                        limit_redirect=4,
+                        limit_time=20,
+                        network_idle: bool = False,
+                        settle_time: float = 0.2,
+                        poll_interval: float = 0.05) -> Navigation | None:
         """
-        for tr in range(limit_redirect):
-            counter = 0
+        sometime page is continuously redirected, this function will wait for some completed redirection
+        with performance log enabled, it follows main frame navigation events and returns as soon as the last document
+        is loaded and no new navigation starts within settle_time, else it waits for document.readyState
+        :param limit_redirect: stop waiting for new navigation after this number of redirects
+        :param limit_time: max seconds to wait
+        :param network_idle: also wait for no request in flight within settle_time
+        :param settle_time: quiet time after load before the navigation is considered settled
+        :param poll_interval: seconds between reads of performance log
+        :return: Navigation with url, redirect chain and timings if performance log is enabled, else None
+        """
+        if not self.performance_log_enabled:
+            for tr in range(limit_redirect):
+                counter = 0
+                while True:
+                    counter += 0.5
+                    sleep(0.5)
+                    if self.is_ready or counter > limit_time:
+                        break
+            return None
+
+        main_frame_id = self.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]["frame"]["id"]
+        tracker = NavigationTracker(main_frame_id)
+        deadline = monotonic() + limit_time
+        last_activity = [monotonic()]
+
+        def feed(events):
+            navigated, networked = tracker.feed(events)
+            if navigated or (network_idle and networked):
+                last_activity[0] = monotonic()
+
+        # subscribe, the log can also be drained by another reader, eg: background thread of capture_responses
+        self.performance_log.subscribe(feed)
+        try:
             while True:
-                counter += 0.5
-                sleep(0.5)
-                if self.is_ready or counter > limit_time:
-                    break
+                self.performance_log.poll()
+                if tracker.navigations == 0:
+                    # navigation events were read before, only current state is known
+                    tracker.loaded = self.is_ready
+
+                idle = not tracker.inflight
+                quiet = monotonic() - last_activity[0] >= settle_time or tracker.navigations > limit_redirect
+                if tracker.loaded and quiet and (idle or not network_idle):
+                    return tracker.result(settled=True, network_idle=idle)
+                if monotonic() > deadline:
+                    return tracker.result(settled=False, network_idle=idle)
+                sleep(poll_interval)
+        finally:
+            self.performance_log.unsubscribe(feed)
+
+    def reset(self, url: str = "about:blank", timeout: float = 10):
+        """
+        reset driver to a clean state, then open url
+        - a tab is opened in a new browser context, which has its own cookies, storage, IndexedDB and cache
+        - all other tabs are closed, the previous browser context is disposed with all its data
+        - if browser contexts are not available, site data of visited origins and all cookies are cleared instead
+        - with profile_template, site data is cleared in the profile, so its warm HTTP cache is kept
+        visited origins are read from the session history and frames of open tabs, with performance log also from
+        every document since the last reset: redirect hops, iframes, closed tabs
+        raise error if driver is not responding, so caller can decide to quit it
+        :param url: url to open after reset
+        :param timeout: max seconds to wait for the new tab
+        """
+        handles = self.window_handles
+        if self._origin_tracker is not None:
+            # read pending navigation events
+            self.performance_log.poll()
+        # a new browser context is in memory, it would drop the disk cache of the cloned profile
+        context = None
+        if not self.profile_dir:
+            try:
+                context = self.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+            except WebDriverException:
+                pass
+        if context is None:
+            self._clear_site_data(handles)
+            if self._origin_tracker is not None:
+                self._origin_tracker.clear()
+            self.get(url)
+            return
+
+        target = self.execute_cdp_cmd("Target.createTarget", {"url": "about:blank",
+                                                              "browserContextId": context})["targetId"]
+        deadline = monotonic() + timeout
+        while True:
+            handle = next((h for h in self.window_handles if _target_id(h) == target), None)
+            if handle is not None:
+                break
+            if monotonic() > deadline:
+                raise WebDriverException(f"new tab is not found after {timeout}s")
+            sleep(0.05)
+
+        for old in handles:
+            self.switch_to.window(old)
+            self.close()
+        self.switch_to.window(handle)
+        if self._browser_context_id:
+            self.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": self._browser_context_id})
+        self._browser_context_id = context
+        if self._origin_tracker is not None:
+            self._origin_tracker.clear()
+        if self._download_tracker is not None:
+            self._download_tracker.set_behavior(context)
+        self.get(url)
+
+    def _clear_site_data(self, handles: list[str]):
+        origins = set(self._origin_tracker.origins) if self._origin_tracker is not None else set()
+        for handle in reversed(handles):
+            self.switch_to.window(handle)
+            origins.update(self._tab_origins())
+            if handle != handles[0]:
+                self.close()
+        self.switch_to.window(handles[0])
+        for origin in sorted(origins - {None}):
+            self.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        self.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+    def _tab_origins(self) -> set[str | None]:
+        """origins of the session history and of the frames of current tab"""
+        history = self.execute_cdp_cmd("Page.getNavigationHistory", {})
+        origins = {url_origin(entry.get("url")) for entry in history.get("entries", [])}
+        trees = [self.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]]
+        while trees:
+            tree = trees.pop()
+            origins.add(url_origin(tree["frame"].get("url")))
+            trees.extend(tree.get("childFrames", []))
+        return origins
 
     @ignore_error
     def remove_element(self, element: Element | WebElement):
@@ -291,11 +852,26 @@ class Driver(webdriver.Chrome):
         self.execute_script("var element = arguments[0];element.parentNode.removeChild(element);", element)
 
     @ignore_error
-    def remove_element_by_xpath(self, xpath, delay_before: float = 0.5, delay_after: float = 0.5):
-        """
-        remove element from DOM by xpath
-        """
-        sleep(delay_before)
-        ele = self.get_element(xpath)
+    def remove_element_by_xpath(self,
+                                xpath,
+                                delay_before: float | None = None,
+                                delay_after: float | None = None,
+                                timeout: float = 0):
+        """
+        remove element from DOM by xpath, nothing is done if it is not present
+        :param delay_before: fixed seconds to sleep before, default None: no sleep
+        :param delay_after: fixed seconds to sleep after, default None: no sleep
+        :param timeout: max seconds to wait for element to be present, default 0: check once
+        """
+        if delay_before is not None:
+            sleep(delay_before)
+        if timeout:
+            ele = self.wait_presence(xpath, wait_time=timeout)
+        else:
+            elements = self.find_elements(by=By.XPATH, value=xpath)
+            if not elements:
+                return
+            ele = elements[0]
         self.remove_element(ele)
-        sleep(delay_after)
+        if delay_after is not None:
+            sleep(delay_after)
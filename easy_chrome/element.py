@@ -5,26 +5,100 @@
     - select methods: methods to direct implement select from web Element (not via Select class)
         eg: self.select_visible_text("option1")
     - get element(s): shortcuts for find_element by XPATH
-    - wait and click: shortcuts for wait sometime before and after click
+    - extract: read text/attributes of many elements in one call
+    - get deep: get element(s) across shadow roots, eg: host >>> inner-host >>> button
+    - wait and click: click when element is actionable, or wait sometime before and after click
+    - wait actionable: wait element to be attached, visible, enabled and stable
     - wait
 """
 
 from __future__ import annotations
+from selenium.common.exceptions import (ElementClickInterceptedException, ElementNotInteractableException,
+                                        NoSuchElementException, StaleElementReferenceException,
+                                        TimeoutException, WebDriverException)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import Select
-from time import sleep
+from time import sleep, monotonic
+
+from . import scripts
+from .utils import split_deep_selector
 
 
 class Element(WebElement):
-    def __init__(self, element: WebElement):
+    _auto_wait_timeout = 10
+
+    def __init__(self, element: WebElement, xpath: str | None = None, root=None):
+        """
+        :param element: selenium WebElement
+        :param xpath: xpath used to find the element, to find it again when it is stale
+        :param root: driver or element which xpath is evaluated from, default is driver
+        """
         super().__init__(parent=element.parent, id_=element.id)
+        self._xpath = xpath
+        self._root = root
+
+    def _relocate(self) -> bool:
+        """find stale element again by its xpath"""
+        if self._xpath is None:
+            return False
+        root = self._root if self._root is not None else self.parent
+        try:
+            self._id = root.find_element(by=By.XPATH, value=self._xpath).id
+        except WebDriverException:
+            return False
+        return True
+
+    def wait_actionable(self, timeout: float = _auto_wait_timeout, click: bool = False) -> Element:
+        """
+        wait element to be attached, visible, enabled and stable (not animating), checked in one call per try
+        :param timeout: max seconds to wait
+        :param click: also scroll it into view and check that it is not covered by another element
+        :return: self, raise TimeoutException with the last reason
+        """
+        deadline = monotonic() + timeout
+        while True:
+            try:
+                reason = self.parent.execute_async_script(scripts.ACTIONABLE, self, click)
+            except StaleElementReferenceException:
+                if not self._relocate():
+                    raise
+                reason = "stale"
+            if reason == "ok":
+                return self
+            if monotonic() > deadline:
+                raise TimeoutException(f"element is not actionable after {timeout}s: {reason}")
+            sleep(0.05)
 
-    def clear_and_type(self, content: str):
-        """clear input and type content"""
-        self.clear()
-        sleep(0.5)
-        self.send_keys(content)
+    def _auto_wait(self, action, timeout: float, click: bool = False):
+        """run action when element is actionable, retry on stale element and intercepted click"""
+        deadline = monotonic() + timeout
+        while True:
+            self.wait_actionable(max(deadline - monotonic(), 0), click)
+            try:
+                return action()
+            except StaleElementReferenceException:
+                if not self._relocate() or monotonic() > deadline:
+                    raise
+            except (ElementClickInterceptedException, ElementNotInteractableException):
+                if monotonic() > deadline:
+                    raise
+                sleep(0.05)
+
+    def clear_and_type(self, content: str, delay: float | None = None, timeout: float = _auto_wait_timeout):
+        """
+        clear input and type content
+        :param delay: fixed seconds to sleep between clear and type, default None: wait element to be actionable
+        :param timeout: max seconds to wait for element to be actionable
+        """
+        if delay is not None:
+            self.clear()
+            sleep(delay)
+            self.send_keys(content)
+            return
+
+        self._auto_wait(self.clear, timeout)
+        self._auto_wait(lambda: self.send_keys(content), timeout)
 
     def select_value(self, value):
         """select element by value"""
@@ -40,7 +114,7 @@ class Element(WebElement):
 
     def get_element(self, xpath) -> Element:
         """get element by Xpath from root element"""
-        return Element(self.find_element(by=By.XPATH, value=xpath))
+        return Element(self.find_element(by=By.XPATH, value=xpath), xpath, self)
 
     def get_elements(self, xpath) -> list[Element]:
         """get list of elements by Xpath from root element"""
@@ -54,12 +128,36 @@ class Element(WebElement):
         """get list of elements by Xpath from root element"""
         return self.get_elements(xpath)
 
-    def wait_and_click(self, bef: float = 0.5, aft: float = 0):
+    def extract(self, xpath: str, fields: dict[str, str] | list[str] | None = None) -> list:
+        """read fields of all elements located by Xpath from root element in one call, see Driver.extract"""
+        if isinstance(fields, list):
+            fields = {spec: spec for spec in fields}
+        return self.parent.execute_script(scripts.EXTRACT, xpath, fields, self)
+
+    def get_deep(self, selector: str) -> Element:
+        """get element across shadow roots from root element, eg: "inner-host >>> button", see Driver.get_deep"""
+        element = self.parent.execute_script(scripts.QUERY_DEEP, split_deep_selector(selector), False, False, self)
+        if element is None:
+            raise NoSuchElementException(f"get_deep, selector: {selector}")
+        return Element(element)
+
+    def get_all_deep(self, selector: str) -> list[Element]:
+        """get all elements across shadow roots from root element, see Driver.get_all_deep"""
+        return [Element(item) for item in
+                self.parent.execute_script(scripts.QUERY_DEEP, split_deep_selector(selector), True, False, self)]
+
+    def wait_and_click(self, bef: float | None = None, aft: float = 0, timeout: float = _auto_wait_timeout):
         """
         wait sometime before and after click
+        :param bef: fixed seconds to sleep before click, default None: wait element to be actionable
+        :param aft: fixed seconds to sleep after click
+        :param timeout: max seconds to wait for element to be actionable, retry on stale element or intercepted click
         """
-        sleep(bef)
-        self.click()
+        if bef is not None:
+            sleep(bef)
+            self.click()
+        else:
+            self._auto_wait(self.click, timeout, click=True)
         sleep(aft)
 
     def wait(self, wait_time: float = 0.5) -> Element:
@@ -0,0 +1,49 @@
+"""
+    This module reads chrome DevTools Protocol events from the performance log
+    - driver must be created with set_chrome(performance_log=True)
+    - every poll drains the log, so events are dispatched to all subscribers of the same driver
+        eg:
+            driver.performance_log.subscribe(lambda events: print(len(events)))
+            driver.performance_log.poll()
+"""
+
+from __future__ import annotations
+import json
+import threading
+
+
+class PerformanceLog:
+    def __init__(self, driver):
+        self._driver = driver
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """
+        :param callback: function(events), called with list of {'method', 'params', 'webview', 'timestamp'}
+            on every poll
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def poll(self) -> list[dict]:
+        """
+        drain performance log and dispatch events to subscribers
+        :return: list of CDP events, {'method': ..., 'params': ..., 'webview': tab target id, 'timestamp': ms}
+        """
+        with self._lock:
+            events = []
+            for entry in self._driver.get_log("performance"):
+                log = json.loads(entry["message"])
+                message = log["message"]
+                # target id of the tab which sent the event, and log time in milliseconds
+                message["webview"] = log.get("webview")
+                message["timestamp"] = entry.get("timestamp")
+                events.append(message)
+
+            for callback in list(self._subscribers):
+                callback(events)
+        return events
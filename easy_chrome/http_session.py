@@ -0,0 +1,132 @@
+"""
+    This module provides a requests Session which uses the identity of a Driver
+    - user agent and proxy of the browser
+    - cookie jar is updated from the browser (all domains, httpOnly included) by one CDP call,
+      and refreshed only when the browser cookies may have changed, cookies set by API responses are kept
+    - keep-alive connection pool with configurable size
+        eg:
+            session = driver.http_session(pool_size=20)
+            data = session.get("https://example.com/api/items").json()
+"""
+
+from __future__ import annotations
+import threading
+from contextlib import suppress
+from http.cookiejar import DefaultCookiePolicy
+from time import monotonic
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import create_cookie
+
+from .utils import ignore_error
+
+
+class BrowserSession(requests.Session):
+    def __init__(self, driver, pool_size: int = 10, check_interval: float = 1.0):
+        """
+        :param driver: Driver to copy identity from
+        :param pool_size: max keep-alive connections per host
+        :param check_interval: min seconds between checks of browser cookies
+            - with performance log: check reads Set-Cookie events and document.cookie of current tab,
+              cookies are copied only if they changed
+            - without: cookies are copied on every check
+        """
+        super().__init__()
+        self.driver = driver
+        self.check_interval = check_interval
+        self._checked = None
+        self._dirty = True
+        self._page_cookies = None
+        # (domain, path, name) copied from the browser by the last sync
+        self._copied = set()
+        self._lock = threading.Lock()
+        # host-only cookies (domain without leading dot) are not sent to subdomains, as in the browser
+        self._cookie_policy = DefaultCookiePolicy(strict_ns_domain=DefaultCookiePolicy.DomainStrictNonDomain)
+        self.cookies.set_policy(self._cookie_policy)
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+        self.headers["User-Agent"] = driver.user_agent
+        if driver.proxy:
+            proxy = f"http://{driver.proxy}"
+            self.proxies.update({"http": proxy, "https": proxy})
+
+        if driver.performance_log_enabled:
+            driver.performance_log.subscribe(self._on_events)
+
+    def _on_events(self, events: list[dict]):
+        for event in events:
+            if event.get("method") != "Network.responseReceivedExtraInfo":
+                continue
+            headers = event.get("params", {}).get("headers", {})
+            if any(key.lower() == "set-cookie" for key in headers):
+                self._dirty = True
+                return
+
+    def sync_cookies(self, force: bool = False):
+        """
+        copy browser cookies to this session if they may have changed
+        :param force: copy without checking
+        """
+        with self._lock:
+            now = monotonic()
+            if not force and self._checked is not None and now - self._checked < self.check_interval:
+                return
+            self._checked = now
+
+            if self.driver.performance_log_enabled:
+                if not force:
+                    self.driver.performance_log.poll()
+                # cookies written by page javascript have no Set-Cookie header
+                page_cookies = ignore_error(self.driver.execute_script)("return document.cookie;")
+                if page_cookies != self._page_cookies:
+                    self._dirty = True
+                self._page_cookies = page_cookies
+                if not force and not self._dirty:
+                    return
+
+            cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+            copied = set()
+            for cookie in cookies:
+                expires = None if cookie.get("session") else int(cookie["expires"])
+                jar_cookie = create_cookie(name=cookie["name"],
+                                           value=cookie["value"],
+                                           domain=cookie["domain"],
+                                           path=cookie.get("path", "/"),
+                                           secure=cookie.get("secure", False),
+                                           expires=expires,
+                                           rest={"HttpOnly": cookie.get("httpOnly", False)})
+                # CDP reports host-only cookies with a dotless domain
+                jar_cookie.domain_specified = cookie["domain"].startswith(".")
+                self.cookies.set_cookie(jar_cookie)
+                copied.add((cookie["domain"], cookie.get("path", "/"), cookie["name"]))
+
+            # merge: only cookies deleted in the browser since the last sync are removed
+            for domain, path, name in self._copied - copied:
+                with suppress(KeyError):
+                    self.cookies.clear(domain, path, name)
+            self._copied = copied
+            self._dirty = False
+
+    def prepare_request(self, request):
+        prepared = super().prepare_request(request)
+        # requests merges cookies into a new jar with the default policy, apply ours and build the header again,
+        # the same jar is used for the requests of redirects
+        prepared._cookies.set_policy(self._cookie_policy)
+        user_cookie = any(key.lower() == "cookie" for key in request.headers or {}) or "Cookie" in self.headers
+        if not user_cookie:
+            prepared.headers.pop("Cookie", None)
+            prepared.prepare_cookies(prepared._cookies)
+        return prepared
+
+    def request(self, method, url, *args, **kwargs):
+        self.sync_cookies()
+        return super().request(method, url, *args, **kwargs)
+
+    def close(self):
+        if self.driver.performance_log_enabled:
+            self.driver.performance_log.unsubscribe(self._on_events)
+        super().close()
@@ -0,0 +1,178 @@
+"""
+    This module keeps latency histograms of WebDriver commands
+    - each command is recorded with the easy_chrome shortcut which issued it (eg: Driver.wait_visible)
+    - fixed buckets, so memory does not grow with number of commands
+    - export as dict / json, or prometheus text format
+        eg:
+            metrics = driver.enable_metrics()
+            driver.wait_visible(xpath)
+            print(metrics.summary())
+            print(metrics.to_prometheus())
+"""
+
+from __future__ import annotations
+import json
+import os
+import sys
+import threading
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float("inf"))
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def find_shortcut(depth: int = 2, limit: int = 40) -> str | None:
+    """
+    :param depth: frames to skip, the caller of the function which calls find_shortcut is at depth 2
+    :param limit: max frames to walk
+    :return: outermost easy_chrome function in current call stack, eg: Driver.wait_visible
+    """
+    shortcut = None
+    frame = sys._getframe(depth)
+    while frame is not None and limit > 0:
+        code = frame.f_code
+        if os.path.dirname(code.co_filename) == _PACKAGE_DIR:
+            shortcut = _qualname(frame)
+        frame = frame.f_back
+        limit -= 1
+    return shortcut
+
+
+def _qualname(frame) -> str:
+    """qualified name of the function of frame, eg: Driver.wait_visible"""
+    code = frame.f_code
+    qualname = getattr(code, "co_qualname", None)
+    if qualname is not None:
+        return qualname
+    # python < 3.11: find the class which defines the method, from self / cls of the frame
+    owner = frame.f_locals.get("self", frame.f_locals.get("cls"))
+    if owner is None:
+        return code.co_name
+    owner_cls = owner if isinstance(owner, type) else type(owner)
+    for cls in owner_cls.__mro__:
+        attr = vars(cls).get(code.co_name)
+        # property, classmethod / staticmethod, then decorators made by functools.wraps
+        attr = getattr(attr, "fget", None) or getattr(attr, "__func__", None) or attr
+        while attr is not None:
+            func_code = getattr(attr, "__code__", None)
+            if func_code is not None and (func_code.co_filename, func_code.co_firstlineno) == \
+                    (code.co_filename, code.co_firstlineno):
+                return f"{cls.__name__}.{code.co_name}"
+            attr = getattr(attr, "__wrapped__", None)
+    return f"{owner_cls.__name__}.{code.co_name}"
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.errors = 0
+        self.sum = 0.0
+
+    def observe(self, duration: float, error: bool = False):
+        for i, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += duration
+        if error:
+            self.errors += 1
+
+    def merge(self, other: Histogram):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.errors += other.errors
+        self.sum += other.sum
+
+    def quantile(self, q: float) -> float:
+        """estimate quantile by linear interpolation inside the bucket"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(BUCKETS, self.counts):
+            if count and seen + count >= rank:
+                if bound == float("inf"):
+                    return lower
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound if bound != float("inf") else lower
+        return lower
+
+    def as_dict(self) -> dict:
+        return {"count": self.count,
+                "errors": self.errors,
+                "sum": self.sum,
+                "avg": self.sum / self.count if self.count else 0.0,
+                "p50": self.quantile(0.5),
+                "p95": self.quantile(0.95),
+                "p99": self.quantile(0.99)}
+
+
+class Metrics:
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, command: str, shortcut: str | None, duration: float, error: bool = False):
+        key = (command, shortcut or "")
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(duration, error)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def by_command(self) -> dict[str, Histogram]:
+        merged = {}
+        with self._lock:
+            for (command, _), histogram in self._histograms.items():
+                merged.setdefault(command, Histogram()).merge(histogram)
+        return merged
+
+    def summary(self) -> dict:
+        """
+        :return: {'commands': {command: stats}, 'shortcuts': {shortcut: {command: stats}}}
+            stats: count, errors, sum, avg, p50, p95, p99 (seconds)
+        """
+        with self._lock:
+            items = list(self._histograms.items())
+        shortcuts = {}
+        for (command, shortcut), histogram in items:
+            shortcuts.setdefault(shortcut, {})[command] = histogram.as_dict()
+        return {"commands": {command: histogram.as_dict() for command, histogram in self.by_command().items()},
+                "shortcuts": shortcuts}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.summary(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "easy_chrome") -> str:
+        """
+        :return: prometheus text exposition format
+        """
+        name = f"{prefix}_command_duration_seconds"
+        lines = [f"# HELP {name} WebDriver command latency.",
+                 f"# TYPE {name} histogram"]
+        errors = []
+        with self._lock:
+            items = sorted(self._histograms.items())
+        for (command, shortcut), histogram in items:
+            labels = f'command="{command}",shortcut="{shortcut}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+            errors.append(f"{prefix}_command_errors_total{{{labels}}} {histogram.errors}")
+
+        lines.append(f"# HELP {prefix}_command_errors_total WebDriver commands which raised error.")
+        lines.append(f"# TYPE {prefix}_command_errors_total counter")
+        lines.extend(errors)
+        return "\n".join(lines) + "\n"
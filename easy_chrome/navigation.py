@@ -0,0 +1,127 @@
+"""
+    This module follows main frame navigation from CDP events of the performance log
+    - redirect chain: every document request of the main frame, with status and time
+    - settled: load event is fired for the last document and no new navigation starts for a short time
+    - network idle: no request in flight for the same time
+    - visited origins: origins of every document of every frame, including redirect hops, for Driver.reset
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+
+@dataclass
+class Navigation:
+    url: str | None = None
+    redirects: list[dict] = field(default_factory=list)
+    duration: float = 0.0
+    settled: bool = False
+    network_idle: bool = False
+
+    @property
+    def redirect_count(self) -> int:
+        return max(len(self.redirects) - 1, 0)
+
+
+class NavigationTracker:
+    def __init__(self, main_frame_id: str):
+        """
+        :param main_frame_id: frame id of the top level frame, from Page.getFrameTree
+        """
+        self.main_frame_id = main_frame_id
+        self.redirects = []
+        self.loaded = False
+        self.inflight = set()
+        self._start = None
+        self._last_timestamp = None
+
+    @property
+    def navigations(self) -> int:
+        return len(self.redirects)
+
+    def feed(self, events: list[dict]) -> tuple[bool, bool]:
+        """
+        update state from CDP events
+        :return: (navigation activity is found, network activity is found)
+        """
+        navigated = networked = False
+        for event in events:
+            method, params = event.get("method"), event.get("params", {})
+            timestamp = params.get("timestamp")
+
+            if method == "Network.requestWillBeSent":
+                self.inflight.add(params["requestId"])
+                networked = True
+                if params.get("type") == "Document" and params.get("frameId") == self.main_frame_id:
+                    self._on_document(params, timestamp)
+                    navigated = True
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                self.inflight.discard(params.get("requestId"))
+                networked = True
+            elif method == "Network.responseReceived":
+                if params.get("type") == "Document" and self.redirects \
+                        and self.redirects[-1]["request_id"] == params.get("requestId"):
+                    self.redirects[-1]["status"] = params["response"].get("status")
+            elif method == "Page.loadEventFired":
+                self.loaded = True
+                navigated = True
+
+            if timestamp is not None:
+                self._last_timestamp = timestamp
+        return navigated, networked
+
+    def _on_document(self, params: dict, timestamp: float | None):
+        if self._start is None:
+            self._start = timestamp
+        redirect_response = params.get("redirectResponse")
+        if redirect_response and self.redirects:
+            self.redirects[-1]["status"] = redirect_response.get("status")
+        self.redirects.append({"url": params["request"]["url"],
+                               "status": None,
+                               "request_id": params["requestId"],
+                               "time": (timestamp - self._start) if timestamp is not None else None})
+        self.loaded = False
+
+    def result(self, settled: bool, network_idle: bool) -> Navigation:
+        duration = 0.0
+        if self._start is not None and self._last_timestamp is not None:
+            duration = self._last_timestamp - self._start
+        return Navigation(url=self.redirects[-1]["url"] if self.redirects else None,
+                          redirects=[{k: v for k, v in hop.items() if k != "request_id"} for hop in self.redirects],
+                          duration=duration,
+                          settled=settled,
+                          network_idle=network_idle)
+
+
+def url_origin(url: str | None) -> str | None:
+    """
+    :return: origin of a http(s) url, eg: https://example.com:8443, None for other urls (about:blank, data:, ...)
+    """
+    if not url:
+        return None
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc.rsplit('@', 1)[-1].lower()}"
+
+
+class OriginTracker:
+    def __init__(self):
+        self.origins = set()
+
+    def __call__(self, events: list[dict]):
+        for event in events:
+            method, params = event.get("method"), event.get("params", {})
+            if method == "Network.requestWillBeSent" and params.get("type") == "Document":
+                # every hop of a redirect chain, of main frame and iframes
+                origin = url_origin(params.get("request", {}).get("url"))
+            elif method == "Page.frameNavigated":
+                origin = url_origin(params.get("frame", {}).get("url"))
+            else:
+                continue
+            if origin is not None:
+                self.origins.add(origin)
+
+    def clear(self):
+        self.origins.clear()
@@ -0,0 +1,206 @@
+"""
+    This module keeps some Driver instances warm, so jobs do not pay chrome cold start every time
+    - driver: context manager to borrow a driver, it is reset when returned
+        eg:
+            pool = DriverPool(size=4, headless=True)
+            with pool.driver() as driver:
+                driver.get(url)
+            pool.close()
+    - a driver is recycled after max_uses jobs, or when it can not be reset (crashed)
+    - stats: hit rate and checkout wait time
+"""
+
+from __future__ import annotations
+from contextlib import contextmanager
+from time import perf_counter
+import queue
+import threading
+
+from .driver import Driver
+from .utils import ignore_error
+
+
+class DriverPool:
+    def __init__(self,
+                 size: int = 2,
+                 max_uses: int = 50,
+                 reset_url: str = "about:blank",
+                 driver_cls: type[Driver] = Driver,
+                 max_launch_errors: int = 3,
+                 **chrome_kwargs):
+        """
+        :param size: number of drivers to keep (idle + in use)
+        :param max_uses: recycle a driver after this number of jobs
+        :param reset_url: url to open when a driver is returned to pool
+        :param driver_cls: Driver class, its set_chrome is used to launch drivers
+        :param max_launch_errors: checkout raises after this number of launch errors in a row, eg: chrome is missing
+        :param chrome_kwargs: arguments for set_chrome
+        """
+        if size < 1:
+            raise ValueError(f"Invalid pool size: {size}, expected >= 1")
+
+        self.size = size
+        self.max_uses = max_uses
+        self.reset_url = reset_url
+        self.max_launch_errors = max_launch_errors
+        self._driver_cls = driver_cls
+        self._chrome_kwargs = chrome_kwargs
+
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._alive = 0
+        self._closed = False
+        self._last_error = None
+        # launch errors in a row, reset by a successful launch
+        self._launch_errors = 0
+        self._stats = {'checkouts': 0, 'hits': 0, 'misses': 0, 'wait_total': 0.0, 'wait_max': 0.0,
+                       'launched': 0, 'launch_errors': 0, 'recycled': 0, 'crashed': 0}
+
+        self._ensure_capacity()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _ensure_capacity(self):
+        """launch drivers in background until pool has enough drivers"""
+        with self._lock:
+            if self._closed:
+                return
+            missing = self.size - self._alive
+            self._alive += max(missing, 0)
+
+        for _ in range(missing):
+            threading.Thread(target=self._launch, daemon=True).start()
+
+    def _launch(self):
+        try:
+            driver = self._driver_cls.set_chrome(**self._chrome_kwargs)
+        except Exception as e:
+            with self._lock:
+                self._alive -= 1
+                self._last_error = e
+                self._launch_errors += 1
+                self._stats['launch_errors'] += 1
+            return
+
+        with self._lock:
+            self._stats['launched'] += 1
+            self._launch_errors = 0
+            self._uses[id(driver)] = 0
+        self._release(driver)
+
+    def _release(self, driver: Driver):
+        # put under lock, else close() can drain the queue before the driver is put and never quit it
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._idle.put(driver)
+        if closed:
+            self._retire(driver)
+
+    def _retire(self, driver: Driver):
+        ignore_error(driver.quit)()
+        with self._lock:
+            self._alive -= 1
+            self._uses.pop(id(driver), None)
+        self._ensure_capacity()
+
+    def _checkout(self, timeout: float | None) -> Driver:
+        start = perf_counter()
+        try:
+            driver = self._idle.get_nowait()
+            hit = True
+        except queue.Empty:
+            hit = False
+            driver = None
+
+        while driver is None:
+            if self._closed:
+                raise RuntimeError("DriverPool is closed")
+            with self._lock:
+                errors = self._launch_errors
+                if errors >= self.max_launch_errors:
+                    # the next checkout tries to launch again
+                    self._launch_errors = 0
+            if errors >= self.max_launch_errors:
+                raise RuntimeError(f"driver launch failed {errors} times in a row, "
+                                   f"last launch error: {self._last_error}") from self._last_error
+            waited = perf_counter() - start
+            if timeout is not None and waited >= timeout:
+                raise TimeoutError(f"no driver available after {timeout}s, last launch error: {self._last_error}")
+            # re-launch if some launches failed
+            self._ensure_capacity()
+            slice_time = 1 if timeout is None else min(1, timeout - waited)
+            try:
+                driver = self._idle.get(timeout=slice_time)
+            except queue.Empty:
+                pass
+
+        wait = perf_counter() - start
+        with self._lock:
+            self._stats['checkouts'] += 1
+            self._stats['hits' if hit else 'misses'] += 1
+            self._stats['wait_total'] += wait
+            self._stats['wait_max'] = max(self._stats['wait_max'], wait)
+        return driver
+
+    def _checkin(self, driver: Driver):
+        with self._lock:
+            self._uses[id(driver)] = uses = self._uses.get(id(driver), 0) + 1
+
+        if self._closed or uses >= self.max_uses:
+            with self._lock:
+                self._stats['recycled'] += 1
+            self._retire(driver)
+            return
+
+        try:
+            driver.reset(self.reset_url)
+        except Exception:
+            with self._lock:
+                self._stats['crashed'] += 1
+            self._retire(driver)
+            return
+
+        self._release(driver)
+
+    @contextmanager
+    def driver(self, timeout: float | None = None):
+        """
+        borrow a warm driver, it is reset (or recycled) when the block ends
+        :param timeout: max seconds to wait for a driver, None to wait forever
+        :return: Driver
+        """
+        driver = self._checkout(timeout)
+        try:
+            yield driver
+        finally:
+            self._checkin(driver)
+
+    @property
+    def stats(self) -> dict:
+        """
+        :return: pool counters with hit_rate and average checkout wait time
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['idle'] = self._idle.qsize()
+            stats['alive'] = self._alive
+        stats['hit_rate'] = stats['hits'] / stats['checkouts'] if stats['checkouts'] else 0.0
+        stats['wait_avg'] = stats['wait_total'] / stats['checkouts'] if stats['checkouts'] else 0.0
+        return stats
+
+    def close(self):
+        """quit all idle drivers, drivers in use are quit when returned"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(driver)
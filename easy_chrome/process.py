@@ -0,0 +1,208 @@
+"""
+    This module inspects chromedriver / chrome process trees
+    - psutil is used if it is installed, else /proc is read (linux only)
+    - without psutil and /proc (macOS, windows) only the chromedriver pid is handled: memory is not sampled
+      and child processes are not found, so chrome is stopped by quit only
+    - registry: pids of every launched driver are written to a file per driver, so trees left by a crashed
+      worker can be reaped by the next one
+"""
+
+from __future__ import annotations
+import json
+import os
+import signal
+import tempfile
+from time import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+REGISTRY_DIR = os.path.join(tempfile.gettempdir(), "easy_chrome_pids")
+
+
+def _has_proc() -> bool:
+    return os.path.isdir("/proc")
+
+
+def _pid_exists_windows(pid: int) -> bool:
+    # os.kill(pid, 0) terminates the process on windows
+    import ctypes
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+    if not handle:
+        # access denied: process exists but belongs to another user
+        return ctypes.get_last_error() == 5
+    try:
+        code = ctypes.c_ulong()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+            return True
+        return code.value == 259  # STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def pid_exists(pid: int) -> bool:
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if os.name == "nt":
+        return _pid_exists_windows(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def process_name(pid: int) -> str:
+    try:
+        if psutil is not None:
+            return psutil.Process(pid).name()
+        if not _has_proc():
+            return ""
+        with open(f"/proc/{pid}/comm") as f:
+            return f.read().strip()
+    except Exception:
+        return ""
+
+
+def children(pid: int, recursive: bool = True) -> list[int]:
+    """:return: pids of child processes"""
+    if psutil is not None:
+        try:
+            return [p.pid for p in psutil.Process(pid).children(recursive=recursive)]
+        except psutil.Error:
+            return []
+
+    if not _has_proc():
+        return []
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # ppid is the 2nd field after "(comm)", comm can contain spaces
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(entry))
+
+    result, stack = [], [pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            result.append(child)
+            if recursive:
+                stack.append(child)
+    return result
+
+
+def rss(pid: int) -> int:
+    """:return: resident memory of the process in bytes, 0 if it is gone"""
+    try:
+        if psutil is not None:
+            return psutil.Process(pid).memory_info().rss
+        if not _has_proc():
+            return 0
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except Exception:
+        pass
+    return 0
+
+
+def tree_rss(pid: int) -> int:
+    """:return: resident memory of the process and all its children in bytes"""
+    return sum(rss(p) for p in [pid] + children(pid))
+
+
+def kill_tree(pid: int):
+    """kill process and all its children, ignore processes which are already gone"""
+    for p in [pid] + children(pid):
+        try:
+            os.kill(p, signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+        except OSError:
+            pass
+
+
+def _is_chrome(pid: int) -> bool:
+    # pid may be reused by another program since it was recorded
+    return pid_exists(pid) and "chrom" in process_name(pid).lower()
+
+
+def kill_trees(pids: list[int]) -> list[int]:
+    """
+    kill trees of pids collected earlier, eg: before quit, skip pids which are gone or reused by another program
+    :return: killed root pids
+    """
+    killed = []
+    for pid in dict.fromkeys(pids):
+        if _is_chrome(pid):
+            kill_tree(pid)
+            killed.append(pid)
+    return killed
+
+
+def register(driver_pid: int, detach: bool = False) -> str:
+    """
+    record chromedriver pid and chrome pids started by it
+    :return: registry file path
+    """
+    os.makedirs(REGISTRY_DIR, exist_ok=True)
+    path = os.path.join(REGISTRY_DIR, f"{driver_pid}.json")
+    with open(path, "w") as f:
+        json.dump({"owner": os.getpid(),
+                   "driver": driver_pid,
+                   "browsers": children(driver_pid, recursive=False),
+                   "detach": detach,
+                   "created": time()}, f)
+    return path
+
+
+def registered_browsers(driver_pid: int) -> list[int]:
+    """:return: chrome pids recorded by register, empty if there is no record"""
+    try:
+        with open(os.path.join(REGISTRY_DIR, f"{driver_pid}.json")) as f:
+            return json.load(f).get("browsers", [])
+    except (OSError, ValueError):
+        return []
+
+
+def unregister(driver_pid: int):
+    try:
+        os.remove(os.path.join(REGISTRY_DIR, f"{driver_pid}.json"))
+    except OSError:
+        pass
+
+
+def reap_orphans(include_detached: bool = False) -> list[int]:
+    """
+    kill chromedriver / chrome trees whose owner process is gone
+    :param include_detached: also kill browsers started with detach_mode
+    :return: killed root pids
+    """
+    if not os.path.isdir(REGISTRY_DIR):
+        return []
+
+    killed = []
+    for name in os.listdir(REGISTRY_DIR):
+        path = os.path.join(REGISTRY_DIR, name)
+        try:
+            with open(path) as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if pid_exists(record["owner"]) or (record.get("detach") and not include_detached):
+            continue
+
+        killed.extend(kill_trees([record["driver"]] + record.get("browsers", [])))
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return killed
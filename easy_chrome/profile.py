@@ -0,0 +1,133 @@
+"""
+    This module launches sessions from a pre-built chrome profile, so static assets are served from disk cache
+    - build_profile_template: visit some urls with a persistent profile to fill its HTTP cache
+    - clone_profile: copy the template for one session, by reflink (copy-on-write) when the file system supports it,
+      else by a full copy, so sessions never write to the template or to each other
+    - CacheCounter: ratio of responses served from cache, from performance log events
+        eg:
+            build_profile_template("/data/chrome-template", ["https://example.com"], headless=True)
+            driver = Driver.set_chrome(profile_template="/data/chrome-template", performance_log=True)
+            driver.get("https://example.com")
+            print(driver.cache_stats)
+"""
+
+from __future__ import annotations
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# files chrome uses to lock a profile, they must not be copied to a clone
+LOCK_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile", "LOCK")
+
+
+def _reflink_copy(template: str, dest: str) -> bool:
+    if sys.platform == "darwin":
+        command = ["cp", "-c", "-R", os.path.join(template, "."), dest]
+    elif sys.platform.startswith("linux"):
+        command = ["cp", "-a", "--reflink=always", os.path.join(template, "."), dest]
+    else:
+        return False
+    try:
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+    for root, _, files in os.walk(dest):
+        for name in files:
+            if name in LOCK_FILES:
+                os.remove(os.path.join(root, name))
+    return True
+
+
+def clone_profile(template: str, dest: str | None = None, mode: str = "auto") -> str:
+    """
+    :param template: profile directory built by build_profile_template
+    :param dest: clone directory, default a new temp directory
+    :param mode: auto (reflink, else copy), reflink or copy
+    :return: clone directory
+    """
+    if mode not in ("auto", "reflink", "copy"):
+        raise ValueError(f"Invalid clone mode: {mode}, expected: ['auto', 'reflink', 'copy']")
+    if not os.path.isdir(template):
+        raise FileNotFoundError(f"profile template not found: {template}")
+
+    dest = dest or tempfile.mkdtemp(prefix="easy_chrome_profile_")
+    if mode in ("auto", "reflink"):
+        if _reflink_copy(template, dest):
+            return dest
+        if mode == "reflink":
+            raise OSError("reflink copy is not supported by this file system")
+        # clean partial copy
+        shutil.rmtree(dest, ignore_errors=True)
+        os.makedirs(dest, exist_ok=True)
+
+    # chrome rewrites cache entries in place, so files are never shared with the template
+    shutil.copytree(template, dest, symlinks=True, dirs_exist_ok=True, ignore=shutil.ignore_patterns(*LOCK_FILES))
+    return dest
+
+
+class CacheCounter:
+    def __init__(self):
+        self.total = 0
+        self.from_cache = 0
+        self._served = set()
+
+    def __call__(self, events: list[dict]):
+        for event in events:
+            method, params = event.get("method"), event.get("params", {})
+            if method == "Network.requestServedFromCache":
+                self._served.add(params.get("requestId"))
+            elif method == "Network.responseReceived":
+                response = params.get("response", {})
+                self.total += 1
+                if response.get("fromDiskCache") or response.get("fromPrefetchCache") \
+                        or params.get("requestId") in self._served:
+                    self.from_cache += 1
+                self._served.discard(params.get("requestId"))
+
+    def as_dict(self) -> dict:
+        return {"responses": self.total,
+                "from_cache": self.from_cache,
+                "hit_ratio": self.from_cache / self.total if self.total else 0.0}
+
+
+def build_profile_template(template: str, urls: list[str], verify: bool = True, driver_cls=None,
+                           **chrome_kwargs) -> dict | None:
+    """
+    create or refresh a profile template by visiting urls with it
+    :param template: profile directory, created if it does not exist
+    :param urls: pages whose assets should be cached
+    :param verify: visit urls again from a clone and report cache stats
+    :param driver_cls: Driver class, default Driver
+    :param chrome_kwargs: arguments for set_chrome
+    :return: cache stats of the verify pass (responses, from_cache, hit_ratio), None if verify is False
+    """
+    if driver_cls is None:
+        from .driver import Driver
+        driver_cls = Driver
+
+    os.makedirs(template, exist_ok=True)
+    other_args = list(chrome_kwargs.pop("other_args", None) or [])
+    driver = driver_cls.set_chrome(incognito=False,
+                                   other_args=other_args + [f"--user-data-dir={os.path.abspath(template)}"],
+                                   **chrome_kwargs)
+    try:
+        for url in urls:
+            driver.get(url)
+    finally:
+        # quit cleanly so chrome flushes its cache index to disk
+        driver.quit()
+
+    if not verify:
+        return None
+
+    chrome_kwargs["performance_log"] = True
+    driver = driver_cls.set_chrome(profile_template=template, other_args=other_args, **chrome_kwargs)
+    try:
+        for url in urls:
+            driver.get(url)
+        return driver.cache_stats
+    finally:
+        driver.quit()
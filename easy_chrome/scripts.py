@@ -0,0 +1,266 @@
+"""
+    This module contains javascript snippets which are run in page by execute_script / execute_async_script
+    - extract: evaluate xpath and read fields of all matched nodes in one call
+    - wait xpath: resolve as soon as xpath element matches condition, watched by MutationObserver
+    - check xpaths: evaluate many xpath conditions and read current url in one call
+    - export / import storage: read or write all local and session storage of current origin in one call
+    - tab open / navigate / state: start page loads without waiting, check that the new document is loaded
+    - query deep: resolve css selectors across shadow roots (host >>> inner >>> target) in one call
+    - actionable: check element is attached, visible, enabled, stable and not obscured in one call
+    - iter elements: return matched nodes not returned before, scroll or click next when there are none
+"""
+
+_READ_FIELDS = """
+function read(node, spec) {
+    if (spec === 'text') {
+        return node.nodeType === 1 ? node.innerText : node.textContent;
+    }
+    if (spec.charAt(0) === '@') {
+        return node.getAttribute ? node.getAttribute(spec.slice(1)) : null;
+    }
+    if (spec.charAt(0) === '.') {
+        var doc = node.ownerDocument || node;
+        return doc.evaluate(spec, node, null, XPathResult.STRING_TYPE, null).stringValue;
+    }
+    var value = node[spec];
+    return value === undefined ? null : value;
+}
+
+function readFields(node, fields) {
+    if (fields === null) return read(node, 'text');
+    var row = {};
+    for (var key in fields) {
+        row[key] = read(node, fields[key]);
+    }
+    return row;
+}
+"""
+
+EXTRACT = _READ_FIELDS + """
+var xpath = arguments[0], fields = arguments[1], root = arguments[2] || document;
+var doc = root.ownerDocument || root;
+var snapshot = doc.evaluate(xpath, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+
+var rows = [];
+for (var i = 0; i < snapshot.snapshotLength; i++) {
+    rows.push(readFields(snapshot.snapshotItem(i), fields));
+}
+return rows;
+"""
+
+_CHECK_XPATH = """
+function visible(el) {
+    if (el.checkVisibility) {
+        return el.checkVisibility({opacityProperty: true, visibilityProperty: true});
+    }
+    var style = window.getComputedStyle(el);
+    return el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.opacity !== '0';
+}
+
+function checkXpath(xpath, condition) {
+    var el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (condition === 'presence') return el;
+    if (condition === 'visible') return el && visible(el) ? el : null;
+    if (condition === 'clickable') return el && visible(el) && !el.disabled ? el : null;
+    if (condition === 'invisible') return !el ? true : (visible(el) ? null : el);
+    throw new Error('unknown condition: ' + condition);
+}
+"""
+
+WAIT_XPATH = _CHECK_XPATH + """
+var xpath = arguments[0], condition = arguments[1], timeout = arguments[2];
+var done = arguments[arguments.length - 1];
+
+function check() {
+    return checkXpath(xpath, condition);
+}
+
+var result = check();
+if (result) {
+    done(result);
+    return;
+}
+
+var finished = false, observer, interval, timer;
+function finish(value) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    done(value);
+}
+function recheck() {
+    var value = check();
+    if (value) finish(value);
+}
+
+observer = new MutationObserver(recheck);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+// visibility can change without mutation (css transition, scroll, layout)
+interval = setInterval(recheck, 100);
+timer = setTimeout(function () { finish(null); }, timeout);
+"""
+
+CHECK_XPATHS = _CHECK_XPATH + """
+var conditions = arguments[0];
+return {
+    url: window.location.href,
+    results: conditions.map(function (c) { return !!checkXpath(c[1], c[0]); })
+};
+"""
+
+EXPORT_STORAGE = """
+function dump(storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+}
+try {
+    return {origin: window.location.origin, local: dump(window.localStorage), session: dump(window.sessionStorage)};
+} catch (e) {
+    return {origin: window.location.origin, local: {}, session: {}};
+}
+"""
+
+IMPORT_STORAGE = """
+var local = arguments[0], session = arguments[1];
+for (var key in local) window.localStorage.setItem(key, local[key]);
+for (var key in session) window.sessionStorage.setItem(key, session[key]);
+"""
+
+TAB_OPEN = """
+window.open(arguments[0], '_blank', 'noopener');
+"""
+
+TAB_NAVIGATE = """
+window.__easyChromeStale = true;
+window.location.href = arguments[0];
+"""
+
+TAB_STATE = """
+return {ready: document.readyState === 'complete' && !window.__easyChromeStale && location.href !== 'about:blank',
+        url: location.href};
+"""
+
+QUERY_DEEP = """
+var selectors = arguments[0], all = arguments[1], useCache = arguments[2], root = arguments[3] || document;
+
+// shadow roots resolved by selector prefix, cleared on any mutation of an observed scope
+var cache = null;
+if (useCache && root === document) {
+    cache = window.__easyChromeShadowCache;
+    if (!cache) {
+        cache = window.__easyChromeShadowCache = {roots: new Map(), observed: new WeakSet()};
+        cache.observer = new MutationObserver(function () { cache.roots.clear(); });
+    }
+}
+
+function watch(scope) {
+    if (cache && !cache.observed.has(scope)) {
+        cache.observed.add(scope);
+        cache.observer.observe(scope, {childList: true, subtree: true, attributes: true});
+    }
+}
+
+var scopes = [root];
+for (var i = 0; i < selectors.length; i++) {
+    var last = i === selectors.length - 1;
+    var key = selectors.slice(0, i + 1).join(' >>> ');
+    if (!last && cache && cache.roots.has(key)) {
+        scopes = cache.roots.get(key);
+        continue;
+    }
+
+    var matched = [];
+    for (var j = 0; j < scopes.length; j++) {
+        watch(scopes[j]);
+        var nodes = scopes[j].querySelectorAll(selectors[i]);
+        for (var k = 0; k < nodes.length; k++) matched.push(nodes[k]);
+    }
+    if (last) return all ? matched : (matched[0] || null);
+
+    scopes = matched.map(function (node) { return node.shadowRoot; }).filter(Boolean);
+    if (cache) cache.roots.set(key, scopes);
+}
+"""
+
+ACTIONABLE = _CHECK_XPATH + """
+var el = arguments[0], forClick = arguments[1];
+var done = arguments[arguments.length - 1];
+
+if (!el.isConnected) return done('detached');
+if (!visible(el)) return done('hidden');
+if (el.disabled || (el.closest && el.closest('fieldset[disabled]'))) return done('disabled');
+
+if (forClick) {
+    var rect = el.getBoundingClientRect();
+    if (rect.bottom < 0 || rect.right < 0 || rect.top > window.innerHeight || rect.left > window.innerWidth) {
+        el.scrollIntoView({block: 'center', inline: 'center'});
+    }
+}
+
+// stable: same box in two consecutive frames, timer is a fallback for throttled background tabs
+var before = el.getBoundingClientRect(), checked = false;
+function check() {
+    if (checked) return;
+    checked = true;
+    var after = el.getBoundingClientRect();
+    if (before.x !== after.x || before.y !== after.y || before.width !== after.width || before.height !== after.height) {
+        return done('moving');
+    }
+    if (forClick) {
+        var root = el.getRootNode().elementFromPoint ? el.getRootNode() : document;
+        var hit = root.elementFromPoint(after.x + after.width / 2, after.y + after.height / 2);
+        if (!hit || !(hit === el || el.contains(hit))) return done('obscured');
+    }
+    done('ok');
+}
+requestAnimationFrame(function () { requestAnimationFrame(check); });
+setTimeout(check, 100);
+"""
+
+ITER_ELEMENTS = _READ_FIELDS + """
+var xpath = arguments[0], key = arguments[1], limit = arguments[2], fields = arguments[3],
+    remove = arguments[4], scroll = arguments[5], nextXpath = arguments[6];
+
+// nodes are tracked in page, so only new ones cross the wire
+var states = window.__easyChromeIter = window.__easyChromeIter || {};
+var state = states[key] = states[key] || {seen: new WeakSet(), returned: []};
+
+// previous batch is consumed when the next one is requested
+if (remove) {
+    state.returned.forEach(function (node) { if (node.parentNode) node.parentNode.removeChild(node); });
+}
+state.returned = [];
+
+var snapshot = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var items = [], last = null;
+for (var i = 0; i < snapshot.snapshotLength && items.length < limit; i++) {
+    var node = last = snapshot.snapshotItem(i);
+    if (state.seen.has(node)) continue;
+    state.seen.add(node);
+    state.returned.push(node);
+    items.push(fields === null ? node : readFields(node, fields));
+}
+if (items.length) return {items: items, advanced: false};
+
+if (nextXpath) {
+    var next = document.evaluate(nextXpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (next && !next.disabled && next.getAttribute('aria-disabled') !== 'true') {
+        next.click();
+        return {items: [], advanced: true};
+    }
+}
+if (scroll) {
+    // last item covers nested scroll containers, scroll event wakes up loaders when removed items shrank the page
+    if (last) last.scrollIntoView({block: 'end'});
+    window.scrollTo(0, (document.scrollingElement || document.documentElement).scrollHeight);
+    window.dispatchEvent(new Event('scroll'));
+    return {items: [], advanced: true};
+}
+return {items: [], advanced: false};
+"""
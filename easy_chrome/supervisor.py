@@ -0,0 +1,133 @@
+"""
+    This module keeps a long-running Driver healthy
+    - memory of chromedriver + chrome process tree is sampled every few pages
+    - session is restarted when it crosses max_rss_mb or max_pages, cookies and storage are kept (export_state)
+    - pids are registered, trees left by crashed workers are reaped on start, own trees are reaped at exit
+        eg:
+            driver = DriverSupervisor(max_rss_mb=2048, max_pages=500, headless=True)
+            for url in urls:
+                driver.get(url)          # may restart chrome before loading url
+                driver.wait_visible(xpath)
+            driver.quit()
+"""
+
+from __future__ import annotations
+import atexit
+import threading
+
+from . import process
+from .driver import Driver
+from .utils import ignore_error
+
+
+class DriverSupervisor:
+    def __init__(self,
+                 max_rss_mb: float | None = 2048,
+                 max_pages: int | None = 1000,
+                 check_every: int = 10,
+                 keep_state: bool = True,
+                 reap_orphans: bool = True,
+                 driver_cls: type[Driver] = Driver,
+                 **chrome_kwargs):
+        """
+        :param max_rss_mb: restart when process tree memory is above this, None to disable
+        :param max_pages: restart after this number of get(), None to disable
+        :param check_every: sample memory every this number of get()
+        :param keep_state: move cookies and storage of current origin to the new session
+        :param reap_orphans: kill chromedriver / chrome trees of dead workers before starting
+        :param driver_cls: Driver class
+        :param chrome_kwargs: arguments for set_chrome
+        """
+        self.max_rss = max_rss_mb * 1024 * 1024 if max_rss_mb else None
+        self.max_pages = max_pages
+        self.check_every = check_every
+        self.keep_state = keep_state
+        self._driver_cls = driver_cls
+        self._chrome_kwargs = chrome_kwargs
+        self._lock = threading.RLock()
+        self.pages = 0
+        self.restarts = 0
+        self.last_rss = 0
+        self.driver = None
+
+        if reap_orphans:
+            ignore_error(process.reap_orphans)()
+        self._start()
+        atexit.register(self._at_exit)
+
+    def _start(self, state: dict | None = None):
+        kwargs = dict(self._chrome_kwargs)
+        if state:
+            kwargs["state"] = state
+        self.driver = self._driver_cls.set_chrome(**kwargs)
+        self.pages = 0
+        process.register(self.driver_pid, detach=kwargs.get("detach_mode", False))
+
+    @property
+    def driver_pid(self) -> int:
+        return self.driver.service.process.pid
+
+    def memory(self) -> int:
+        """:return: resident memory of chromedriver and chrome processes in bytes"""
+        self.last_rss = process.tree_rss(self.driver_pid)
+        return self.last_rss
+
+    def _stop(self):
+        pid = self.driver_pid
+        # collect the tree before quit: chromedriver exits on quit and leftover chrome processes are reparented
+        tree = [pid] + process.children(pid) + process.registered_browsers(pid)
+        ignore_error(self.driver.quit)()
+        # quit can leave renderers behind when chrome is not responding
+        process.kill_trees(tree)
+        process.unregister(pid)
+
+    def restart(self):
+        """start a new session, keep cookies and storage of current origin if keep_state"""
+        with self._lock:
+            state = ignore_error(self.driver.export_state)() if self.keep_state else None
+            self._stop()
+            self._start(state)
+            self.restarts += 1
+
+    def check(self) -> bool:
+        """
+        restart if session is over a threshold
+        :return: True if restarted
+        """
+        with self._lock:
+            over_pages = self.max_pages is not None and self.pages >= self.max_pages
+            over_memory = False
+            if self.max_rss is not None and self.pages and self.pages % self.check_every == 0:
+                over_memory = self.memory() > self.max_rss
+            if over_pages or over_memory:
+                self.restart()
+                return True
+            return False
+
+    def get(self, url: str):
+        """load url, restart session first if it is over a threshold"""
+        with self._lock:
+            self.check()
+            self.pages += 1
+            return self.driver.get(url)
+
+    def quit(self):
+        with self._lock:
+            if self.driver is None:
+                return
+            self._stop()
+            self.driver = None
+        atexit.unregister(self._at_exit)
+
+    def _at_exit(self):
+        # a detached chrome outlives the interpreter, its registry record is kept for reap_orphans(include_detached)
+        if self._chrome_kwargs.get("detach_mode"):
+            return
+        self.quit()
+
+    def __getattr__(self, name):
+        # forward everything else to the current driver, so restarts are transparent
+        driver = self.__dict__.get("driver")
+        if driver is None:
+            raise AttributeError(name)
+        return getattr(driver, name)
@@ -0,0 +1,167 @@
+"""
+    This module loads many urls in parallel tabs of one Driver
+    - page loads run in background, the driver only switches to a tab when its page is loaded
+    - with performance log enabled, loaded tabs are found by Page.loadEventFired events without switching,
+      else tabs are checked round robin
+    - a tab is reused for the next url as soon as its result is read, results are yielded as they complete
+    - a tab which is not loaded after page_timeout is closed, the next url is opened in a new tab
+        eg:
+            scheduler = TabScheduler(driver, handler=lambda d: d.extract("//h1"), max_tabs=8)
+            for result in scheduler.run(urls):
+                print(result.url, result.value, result.error)
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from time import monotonic, sleep
+from typing import Any, Callable, Iterable, Iterator
+
+from selenium.common.exceptions import TimeoutException
+
+from . import scripts
+
+
+@dataclass
+class TabResult:
+    url: str
+    value: Any = None
+    error: Exception | None = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _target_id(handle: str) -> str:
+    # old chromedriver prefixes window handles
+    return handle.replace("CDwindow-", "")
+
+
+class TabScheduler:
+    def __init__(self,
+                 driver,
+                 handler: Callable | None = None,
+                 max_tabs: int = 5,
+                 page_timeout: float = 30,
+                 poll_interval: float = 0.05):
+        """
+        :param driver: Driver, set_chrome(performance_log=True) avoids switching to tabs which are still loading
+        :param handler: function(driver) -> value, called in the loaded tab, default returns page_source
+        :param max_tabs: max tabs loading at the same time
+        :param page_timeout: seconds before a page is reported as TimeoutException
+        :param poll_interval: seconds between checks when no tab is ready
+        """
+        self.driver = driver
+        self.handler = handler or (lambda d: d.page_source)
+        self.max_tabs = max_tabs
+        self.page_timeout = page_timeout
+        self.poll_interval = poll_interval
+        self._loaded = set()
+
+    def _on_events(self, events: list[dict]):
+        for event in events:
+            if event.get("method") == "Page.loadEventFired" and event.get("webview"):
+                self._loaded.add(event["webview"])
+
+    def _open(self, url: str, known: set, control: str) -> str:
+        # blocked urls are applied to a tab when it is switched to, so it must be blank until then
+        blank = bool(self.driver.blocked_urls)
+        # window.open from the control tab, a script in a loading tab waits for its page load
+        self.driver.switch_to.window(control)
+        self.driver.execute_script(scripts.TAB_OPEN, "about:blank" if blank else url)
+        # window.open returns before chromedriver registers the new target
+        deadline = monotonic() + self.page_timeout
+        while True:
+            handle = next((h for h in self.driver.window_handles if h not in known), None)
+            if handle is not None:
+                known.add(handle)
+                if blank:
+                    self.driver.switch_to.window(handle)
+                    self.driver.execute_script(scripts.TAB_NAVIGATE, url)
+                    self.driver.switch_to.window(control)
+                return handle
+            if monotonic() > deadline:
+                raise TimeoutException(f"new tab is not opened after {self.page_timeout}s: {url}")
+            sleep(self.poll_interval)
+
+    def _candidates(self, tabs: dict) -> list[str]:
+        """tabs which may be loaded"""
+        if not self.driver.performance_log_enabled:
+            return list(tabs)
+        self.driver.performance_log.poll()
+        candidates = [handle for handle in tabs if _target_id(handle) in self._loaded]
+        for handle in candidates:
+            self._loaded.discard(_target_id(handle))
+        return candidates
+
+    def run(self, urls: Iterable[str]) -> Iterator[TabResult]:
+        """
+        :param urls: urls to load, can be a generator
+        :return: iterator of TabResult, in completion order
+        """
+        driver = self.driver
+        queue = iter(urls)
+        control = driver.current_window_handle
+        known = set(driver.window_handles)
+        tabs = {}
+
+        if driver.performance_log_enabled:
+            # drop events of pages loaded before
+            driver.performance_log.poll()
+            driver.performance_log.subscribe(self._on_events)
+
+        try:
+            for _ in range(self.max_tabs):
+                url = next(queue, None)
+                if url is None:
+                    break
+                tabs[self._open(url, known, control)] = (url, monotonic())
+
+            while tabs:
+                done = False
+                for handle in self._candidates(tabs):
+                    url, start = tabs[handle]
+                    driver.switch_to.window(handle)
+                    elapsed = monotonic() - start
+                    timeout = elapsed > self.page_timeout
+                    if not timeout and not driver.execute_script(scripts.TAB_STATE)["ready"]:
+                        continue
+
+                    if timeout:
+                        # a script in the loading tab (eg: window.stop) would wait for its page load, close it
+                        driver.close()
+                        del tabs[handle]
+                        result = TabResult(url, error=TimeoutException(f"page load timeout: {url}"), duration=elapsed)
+                    else:
+                        try:
+                            result = TabResult(url, value=self.handler(driver), duration=elapsed)
+                        except Exception as e:
+                            result = TabResult(url, error=e, duration=elapsed)
+
+                    next_url = next(queue, None)
+                    if next_url is None:
+                        if handle in tabs:
+                            driver.close()
+                            del tabs[handle]
+                    elif handle in tabs:
+                        driver.execute_script(scripts.TAB_NAVIGATE, next_url)
+                        tabs[handle] = (next_url, monotonic())
+                    else:
+                        tabs[self._open(next_url, known, control)] = (next_url, monotonic())
+                    done = True
+                    yield result
+
+                if not done:
+                    # timeout is checked in the next round, even if no load event comes
+                    if driver.performance_log_enabled:
+                        expired = [h for h, (_, start) in tabs.items() if monotonic() - start > self.page_timeout]
+                        self._loaded.update(_target_id(h) for h in expired)
+                    sleep(self.poll_interval)
+        finally:
+            if driver.performance_log_enabled:
+                driver.performance_log.unsubscribe(self._on_events)
+            for handle in tabs:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(control)
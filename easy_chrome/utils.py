@@ -1,9 +1,13 @@
 import functools
+import re
 from contextlib import suppress
 
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 import selenium.webdriver.support.expected_conditions as EC
 
+from . import scripts
+
 
 def ignore_error(func):
     @functools.wraps(func)
@@ -14,6 +18,11 @@ def ignore_error(func):
     return wrapper
 
 
+def split_deep_selector(selector: str) -> list[str]:
+    """split "host >>> inner-host >>> button" to css selector of each shadow level"""
+    return [part.strip() for part in selector.split(">>>")]
+
+
 class WaitList:
     ELE_SELECTOR = {'presence': EC.presence_of_element_located,
                     'visible': EC.visibility_of_element_located,
@@ -27,6 +36,13 @@ class WaitList:
         'url_changes': EC.url_changes,
     }
 
+    URL_CHECK = {
+        'url_to_be': lambda url, value: url == value,
+        'url_contains': lambda url, value: value in url,
+        'url_matches': lambda url, value: re.search(value, url) is not None,
+        'url_changes': lambda url, value: url != value,
+    }
+
     @classmethod
     def validate_value(cls, value):
         if isinstance(value, str):
@@ -58,3 +74,85 @@ class WaitList:
                 raise ValueError(f"Invalid key for wait_list: {key}, "
                                  f"expected: {list(cls.ELE_SELECTOR.keys()) + list(cls.URL_SELECTOR.keys())}")
         return wait_list
+
+    @classmethod
+    def generate_conditions(cls, **kwargs) -> list[tuple[str, str]]:
+        """
+        validate kwargs and flatten them to (key, value) pairs
+        """
+        conditions = []
+        for key, value in kwargs.items():
+            if key not in cls.ELE_SELECTOR and key not in cls.URL_SELECTOR:
+                raise ValueError(f"Invalid key for wait_list: {key}, "
+                                 f"expected: {list(cls.ELE_SELECTOR.keys()) + list(cls.URL_SELECTOR.keys())}")
+            conditions.extend((key, v) for v in cls.validate_value(value))
+        return conditions
+
+    @classmethod
+    def generate_combined(cls, mode: str, user_wait_list, **kwargs):
+        """
+        generate one condition, which evaluates all xpath and url conditions of kwargs by one execute_script per poll,
+        user_wait_list conditions are evaluated one by one after that, only when needed
+        :param mode: any, all or none
+        :param user_wait_list: pre-defined ExpectedCondition
+        :param kwargs: key-value pair, same as generate_wait_list
+        :return: callable for WebDriverWait.until, its result is the list of matched conditions:
+            results of user_wait_list conditions first (eg: element), like selenium any_of / all_of,
+            then (key, value) for kwargs conditions
+        """
+        if mode not in ("any", "all", "none"):
+            raise ValueError(f"Invalid mode: {mode}, expected: ['any', 'all', 'none']")
+
+        conditions = cls.generate_conditions(**kwargs)
+        xpath_conditions = [[key, value] for key, value in conditions if key in cls.ELE_SELECTOR]
+        user_wait_list = user_wait_list or []
+
+        def evaluate(driver) -> list:
+            if not conditions:
+                return []
+            state = driver.execute_script(scripts.CHECK_XPATHS, xpath_conditions)
+            results = iter(state['results'])
+            matched = []
+            for key, value in conditions:
+                if key in cls.ELE_SELECTOR:
+                    ok = next(results)
+                else:
+                    ok = cls.URL_CHECK[key](state['url'], value)
+                if ok:
+                    matched.append((key, value))
+            return matched
+
+        def combined(driver):
+            try:
+                matched = evaluate(driver)
+            except WebDriverException:
+                # page is navigating, try again next poll
+                return False
+
+            if mode == "any" and matched:
+                return matched
+            if mode == "all" and len(matched) < len(conditions):
+                return False
+            if mode == "none" and matched:
+                return False
+
+            results = []
+            for condition in user_wait_list:
+                try:
+                    result = condition(driver)
+                except WebDriverException:
+                    result = False
+                if result:
+                    if mode == "none":
+                        return False
+                    if mode == "any":
+                        return [result]
+                    results.append(result)
+                elif mode == "all":
+                    return False
+
+            if mode == "any":
+                return False
+            return results + matched or True
+
+        return combined
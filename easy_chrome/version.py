@@ -1,15 +1,117 @@
 import os
+import sys
+import json
+import tempfile
+from contextlib import contextmanager
 
-from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.core.constants import DEFAULT_USER_HOME_CACHE_PATH
 import shutil
 import subprocess
 
 from .utils import ignore_error
 
+MANIFEST_PATH = os.path.join(DEFAULT_USER_HOME_CACHE_PATH, "easy_chrome_manifest.json")
+LOCK_PATH = os.path.join(DEFAULT_USER_HOME_CACHE_PATH, "easy_chrome.lock")
+
+CHROME_BINARIES = {
+    "win": [r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+            os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe")],
+    "mac": ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"],
+    "linux": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"],
+}
+
+
+def _os_name():
+    if sys.platform.startswith("win"):
+        return "win"
+    if sys.platform == "darwin":
+        return "mac"
+    return "linux"
+
+
+def _find_chrome_binary():
+    """find chrome binary to use as manifest key, None if not found"""
+    for candidate in CHROME_BINARIES[_os_name()]:
+        path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+        if path and os.path.exists(path):
+            return os.path.realpath(path)
+
+
+def _binary_signature(binary):
+    stat = os.stat(binary)
+    return {"mtime": stat.st_mtime, "size": stat.st_size}
+
+
+def _read_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _atomic_write(path, write, mode=None):
+    """write a temp file in the same directory then rename it, so readers never see a half-written file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        ignore_error(os.remove)(tmp_path)
+        raise
+
+
+@contextmanager
+def _file_lock(path):
+    """cross process lock, released when the block ends"""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            # LK_LOCK retries for 10 seconds, loop until lock is acquired
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _cached_driver_path(binary):
+    """driver path from manifest if chrome binary is not changed, else None"""
+    if binary is None:
+        return None
+    entry = _read_manifest().get(binary)
+    if entry and entry.get("signature") == _binary_signature(binary) and os.path.exists(entry["driver_path"]):
+        return entry["driver_path"]
+
 
 def get_driver_path():
+    binary = _find_chrome_binary()
+    path = _cached_driver_path(binary)
+    if path:
+        return path
+
+    # imported here, it loads requests and friends, which are only needed to install a driver
+    from webdriver_manager.chrome import ChromeDriverManager
 
+    # version is probed before the lock, so processes waiting for it do not probe one after another
     manager = ChromeDriverManager()
     os_type = manager.get_os_type()
     full_version = manager.driver.get_browser_version_from_os()
@@ -26,14 +128,37 @@ def get_driver_path():
         file_name = f"chromedriver_{main_version}"
 
     expect_path = os.path.join(DEFAULT_USER_HOME_CACHE_PATH, file_name)
-
-    if not os.path.exists(expect_path):
-        wdm_path = ChromeDriverManager(driver_version=full_version).install()
-        shutil.copy(wdm_path, expect_path)
+    # chrome binary is not found: nothing to record in manifest, the version probe is the cache key
+    if binary is None and os.path.exists(expect_path):
+        return expect_path
+
+    os.makedirs(DEFAULT_USER_HOME_CACHE_PATH, exist_ok=True)
+    with _file_lock(LOCK_PATH):
+        # another process may have installed it while waiting for the lock
+        if not os.path.exists(expect_path):
+            wdm_path = ChromeDriverManager(driver_version=full_version).install()
+            with open(wdm_path, "rb") as src:
+                _atomic_write(expect_path, lambda dst: shutil.copyfileobj(src, dst), mode=0o755)
+
+        if binary is not None:
+            manifest = _read_manifest()
+            manifest[binary] = {"signature": _binary_signature(binary),
+                                "version": full_version,
+                                "driver_path": expect_path}
+            _atomic_write(MANIFEST_PATH, lambda f: f.write(json.dumps(manifest, indent=2).encode()))
 
     return expect_path
 
 
+def warm_cache():
+    """
+    resolve and install chromedriver ahead of time, eg: at deploy time
+        python -m easy_chrome.version
+    :return: chromedriver path
+    """
+    return get_driver_path()
+
+
 class DriverPath:
     def __init__(self):
         self._path = None
@@ -86,3 +211,7 @@ def _custom_get_win_chrome_version():
             cr_ver = _get_chrome_installed(hive, flag)
             if cr_ver is not None:
                 return cr_ver
+
+
+if __name__ == "__main__":
+    print(warm_cache())
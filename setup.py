@@ -18,8 +18,9 @@ setuptools.setup(
     ],
     license='MIT',
     keywords='easy chrome chrome_driver selenium chromedriver',
-    packages=setuptools.find_packages(),
-    install_requires=['selenium', 'webdriver-manager'],
+    packages=setuptools.find_packages(exclude=["benchmarks", "benchmarks.*", "tests", "tests.*"]),
+    install_requires=['selenium', 'webdriver-manager', 'requests'],
+    extras_require={'psutil': ['psutil']},
     python_requires=">=3.9",
     long_description_content_type="text/markdown",
     project_urls={
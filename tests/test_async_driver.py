@@ -0,0 +1,129 @@
+"""
+    AsyncDriver / AsyncElement facade: wrapping of returned elements and iterators, unwrapping of AsyncElement
+    arguments and the thread pool limit, against a fake driver
+"""
+
+from __future__ import annotations
+import asyncio
+import threading
+import time
+
+from selenium.webdriver.remote.switch_to import SwitchTo
+from selenium.webdriver.remote.webelement import WebElement
+
+from easy_chrome.async_driver import AsyncDriver, AsyncElement, AsyncRunner
+from easy_chrome.driver import Driver
+from easy_chrome.element import Element
+
+
+class FakeDriver:
+    remove_element = Driver.remove_element
+
+    def __init__(self):
+        self.scripts = []
+        self.commands = []
+        self.closed = False
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    @property
+    def title(self):
+        return "home"
+
+    @property
+    def switch_to(self):
+        return SwitchTo(self)
+
+    def execute(self, command, params):
+        self.commands.append((command, params))
+
+    def execute_script(self, script, *args):
+        # selenium serializes only WebElement, an AsyncElement is not JSON serializable
+        for arg in args:
+            for item in arg if isinstance(arg, list) else [arg]:
+                if not isinstance(item, (WebElement, str, int)):
+                    raise TypeError(f"Object of type {type(item).__name__} is not JSON serializable")
+        self.scripts.append((script, args))
+
+    def get_elements(self, xpath):
+        return [WebElement(self, "1"), WebElement(self, "2")]
+
+    def iter_elements(self, xpath):
+        try:
+            for i in range(3):
+                yield WebElement(self, str(i))
+        finally:
+            self.closed = True
+
+    def slow(self):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.05)
+        with self._lock:
+            self.running -= 1
+
+
+def test_properties_and_returned_elements_are_wrapped():
+    async def main():
+        driver = AsyncDriver(FakeDriver(), AsyncRunner(2))
+        assert await driver.title == "home"
+        elements = await driver.get_elements("//a")
+        assert [type(element) for element in elements] == [AsyncElement, AsyncElement]
+        assert isinstance(elements[0].element, Element)
+
+    asyncio.run(main())
+
+
+def test_async_elements_are_unwrapped_in_arguments():
+    async def main():
+        fake = FakeDriver()
+        driver = AsyncDriver(fake, AsyncRunner(2))
+        first, second = await driver.get_elements("//a")
+
+        await driver.execute_script("arguments[0].click();", first)
+        await driver.execute_script("return arguments[0];", [first, second])
+        await driver.remove_element(first)
+        await (await driver.switch_to).frame(second)
+
+        assert [args for _, args in fake.scripts] == [
+            (first.element,), ([first.element, second.element],), (first.element,)]
+        assert fake.commands[0][1] == {"id": second.element}
+
+    asyncio.run(main())
+
+
+def test_generator_is_async_iterator():
+    async def main():
+        fake = FakeDriver()
+        driver = AsyncDriver(fake, AsyncRunner(2))
+        ids = [item.element.id async for item in await driver.iter_elements("//li")]
+        assert ids == ["0", "1", "2"]
+        assert fake.closed
+
+        fake.closed = False
+        items = await driver.iter_elements("//li")
+        async for item in items:
+            assert isinstance(item, AsyncElement)
+            break
+        assert not fake.closed
+        await items.aclose()
+        assert fake.closed
+
+    asyncio.run(main())
+
+
+def test_runner_limits_concurrent_calls_in_every_event_loop():
+    fake = FakeDriver()
+    runner = AsyncRunner(max_workers=2)
+    driver = AsyncDriver(fake, runner)
+
+    async def main():
+        await asyncio.gather(*[driver.slow() for _ in range(6)])
+
+    # a semaphore bound to the first loop would fail in the second one
+    asyncio.run(main())
+    asyncio.run(main())
+    assert fake.max_running == 2
+    runner.shutdown()
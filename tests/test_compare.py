@@ -0,0 +1,37 @@
+"""
+    regression gate of benchmarks.compare
+"""
+
+from benchmarks.compare import compare
+
+
+def _results(**metrics) -> dict:
+    return {"results": metrics}
+
+
+def test_relative_change_over_threshold_is_regression():
+    rows = compare(_results(startup=1.0, wait=2.0), _results(startup=1.2, wait=2.1), threshold=0.1)
+    assert [(name, regressed) for name, _, _, _, regressed in rows] == [("startup", True), ("wait", False)]
+
+
+def test_growth_from_zero_base_is_regression():
+    rows = compare(_results(pool_miss_rate=0), _results(pool_miss_rate=1), threshold=0.1)
+    assert rows == [("pool_miss_rate", 0, 1, float("inf"), True)]
+
+
+def test_zero_on_both_sides_is_no_change():
+    rows = compare(_results(pool_miss_rate=0), _results(pool_miss_rate=0), threshold=0.1)
+    assert rows == [("pool_miss_rate", 0, 0, 0.0, False)]
+
+
+def test_item_counts_must_not_change():
+    base = _results(feed={"keep": {"median": 1.0, "items": 2000, "items_in_dom": 2000},
+                          "remove": {"median": 1.0, "items": 2000, "items_in_dom": 50}})
+    fewer = _results(feed={"keep": {"median": 0.5, "items": 1200, "items_in_dom": 1200},
+                           "remove": {"median": 0.5, "items": 2000, "items_in_dom": 40}})
+    rows = compare(base, fewer, threshold=0.1)
+    assert [name for name, *_, regressed in rows if regressed] == ["feed.keep.items"]
+
+    more = _results(feed={"keep": {"median": 1.0, "items": 2001, "items_in_dom": 2000},
+                          "remove": {"median": 1.0, "items": 2000, "items_in_dom": 50}})
+    assert [name for name, *_, regressed in compare(base, more, threshold=0.1) if regressed] == ["feed.keep.items"]
@@ -0,0 +1,128 @@
+"""
+    DownloadTracker: binding of downloads to expect_download blocks and rename on completion,
+    from synthetic Page.downloadWillBegin / Page.downloadProgress events
+"""
+
+from __future__ import annotations
+import os
+from time import time
+
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from easy_chrome.downloads import DownloadTracker
+
+
+class FakeLog:
+    def __init__(self):
+        self.subscribers = []
+        self.events = []
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    def poll(self):
+        events, self.events = self.events, []
+        for callback in self.subscribers:
+            callback(events)
+        return events
+
+
+class FakeDriver:
+    def __init__(self):
+        self.performance_log = FakeLog()
+        self.behaviors = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == "Browser.setDownloadBehavior"
+        self.behaviors.append(params)
+        return {}
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    driver = FakeDriver()
+    tracker = DownloadTracker(driver, str(tmp_path / "downloads")).start()
+    yield tracker
+    tracker.stop()
+
+
+def _begin(tracker: DownloadTracker, guid: str, filename: str = "report.csv", timestamp: float | None = None):
+    tracker.driver.performance_log.events.append({
+        "method": "Page.downloadWillBegin",
+        "params": {"guid": guid, "url": f"https://example.com/{filename}", "suggestedFilename": filename},
+        "timestamp": time() * 1000 if timestamp is None else timestamp})
+
+
+def _progress(tracker: DownloadTracker, guid: str, state: str = "completed", content: bytes = b"data"):
+    if state == "completed":
+        with open(os.path.join(tracker.download_dir, guid), "wb") as f:
+            f.write(content)
+    tracker.driver.performance_log.events.append({
+        "method": "Page.downloadProgress",
+        "params": {"guid": guid, "totalBytes": len(content), "receivedBytes": len(content), "state": state},
+        "timestamp": time() * 1000})
+
+
+def test_completed_downloads_are_renamed_to_unique_names(tracker):
+    assert tracker.driver.behaviors[0]["behavior"] == "allowAndName"
+    with tracker.expect() as first:
+        _begin(tracker, "guid-1")
+    with tracker.expect() as second:
+        _begin(tracker, "guid-2")
+    _progress(tracker, "guid-1", content=b"first")
+    _progress(tracker, "guid-2", content=b"second")
+
+    # blocks get downloads in order
+    assert first.result(timeout=1).path == os.path.join(tracker.download_dir, "report.csv")
+    assert second.result(timeout=1).path == os.path.join(tracker.download_dir, "report (1).csv")
+    assert open(first.download.path, "rb").read() == b"first"
+    assert first.download.size == 5
+    assert sorted(os.listdir(tracker.download_dir)) == ["report (1).csv", "report.csv"]
+
+
+def test_download_begun_before_the_block_is_not_bound(tracker):
+    _begin(tracker, "early")
+    with tracker.expect() as expected:
+        # read before the block, by its enter poll
+        assert "early" in tracker.downloads
+        # read inside the block, but began before it
+        _begin(tracker, "late-event", timestamp=expected.entered - 500)
+        tracker.poll()
+        assert expected.download is None
+        _begin(tracker, "inside")
+    _progress(tracker, "inside")
+    assert expected.result(timeout=1).guid == "inside"
+
+
+def test_download_after_begin_timeout_is_not_bound(tracker):
+    with tracker.expect(begin_timeout=0.5) as expired:
+        pass
+    with tracker.expect(begin_timeout=10) as waiting:
+        pass
+    _begin(tracker, "guid-1", timestamp=expired.exited + 1000)
+    tracker.poll()
+
+    assert expired.download is None
+    assert not expired.expired(expired.exited + 400)
+    assert expired.expired(expired.exited + 1000)
+    with pytest.raises(TimeoutException, match="no download began"):
+        expired.result(timeout=2)
+    assert waiting.download is tracker.downloads["guid-1"]
+
+
+def test_block_with_error_and_canceled_download(tracker):
+    with pytest.raises(RuntimeError):
+        with tracker.expect():
+            raise RuntimeError("click failed")
+    assert tracker._expectations == []
+
+    with tracker.expect() as expected:
+        _begin(tracker, "guid-1")
+    _progress(tracker, "guid-1", state="canceled")
+    with pytest.raises(WebDriverException, match="canceled"):
+        expected.result(timeout=1)
+    assert tracker.wait_all(timeout=1)[0].state == "canceled"
@@ -0,0 +1,124 @@
+"""
+    BrowserSession: cookies copied from a fake driver, host-only cookies, merge with API cookies, Cookie header
+"""
+
+from __future__ import annotations
+
+import pytest
+import requests
+
+from easy_chrome.http_session import BrowserSession
+
+
+class FakeLog:
+    def __init__(self):
+        self.subscribers = []
+        self.events = []
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    def poll(self):
+        events, self.events = self.events, []
+        for callback in self.subscribers:
+            callback(events)
+        return events
+
+
+class FakeDriver:
+    user_agent = "fake-agent"
+    proxy = ""
+
+    def __init__(self, performance_log: bool = False):
+        self.performance_log_enabled = performance_log
+        self.performance_log = FakeLog()
+        self.browser_cookies = []
+        self.document_cookie = ""
+        self.scripts = 0
+        self.fetches = 0
+
+    def set_cookie(self, name: str, value: str, domain: str):
+        self.browser_cookies = [c for c in self.browser_cookies if (c["name"], c["domain"]) != (name, domain)]
+        self.browser_cookies.append({"name": name, "value": value, "domain": domain, "path": "/", "session": True})
+
+    def execute_script(self, script):
+        assert script == "return document.cookie;"
+        self.scripts += 1
+        return self.document_cookie
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == "Network.getAllCookies"
+        self.fetches += 1
+        return {"cookies": [dict(cookie) for cookie in self.browser_cookies]}
+
+
+def _cookie_header(session: BrowserSession, url: str, **kwargs) -> str | None:
+    return session.prepare_request(requests.Request("GET", url, **kwargs)).headers.get("Cookie")
+
+
+@pytest.fixture
+def driver():
+    driver = FakeDriver()
+    driver.set_cookie("host", "1", "example.com")
+    driver.set_cookie("shared", "2", ".example.com")
+    return driver
+
+
+def test_host_only_cookies_are_not_sent_to_subdomains(driver):
+    session = BrowserSession(driver)
+    session.sync_cookies(force=True)
+
+    assert _cookie_header(session, "https://example.com/") in ("host=1; shared=2", "shared=2; host=1")
+    assert _cookie_header(session, "https://api.example.com/") == "shared=2"
+    assert _cookie_header(session, "https://other.com/") is None
+    assert session.headers["User-Agent"] == "fake-agent"
+
+
+def test_api_cookies_are_kept_and_browser_deletions_are_applied(driver):
+    session = BrowserSession(driver)
+    session.sync_cookies(force=True)
+    # set by an API response of this session, unknown to the browser
+    session.cookies.set("api", "3", domain="example.com", path="/")
+
+    driver.browser_cookies = [cookie for cookie in driver.browser_cookies if cookie["name"] != "host"]
+    driver.set_cookie("shared", "changed", ".example.com")
+    session.sync_cookies(force=True)
+
+    assert {cookie.name: cookie.value for cookie in session.cookies} == {"shared": "changed", "api": "3"}
+
+
+def test_caller_cookie_header_is_kept(driver):
+    session = BrowserSession(driver)
+    session.sync_cookies(force=True)
+    assert _cookie_header(session, "https://example.com/", headers={"Cookie": "mine=1"}) == "mine=1"
+
+    session.headers["Cookie"] = "session=2"
+    assert _cookie_header(session, "https://api.example.com/") == "session=2"
+
+
+def test_cookies_are_copied_only_when_changed_with_performance_log(driver):
+    driver.performance_log_enabled = True
+    session = BrowserSession(driver, check_interval=0)
+    session.sync_cookies()
+    assert (driver.fetches, driver.scripts) == (1, 1)
+
+    session.sync_cookies()
+    # document.cookie is read once per check
+    assert (driver.fetches, driver.scripts) == (1, 2)
+
+    # cookie written by page javascript
+    driver.document_cookie = "js=1"
+    session.sync_cookies()
+    assert (driver.fetches, driver.scripts) == (2, 3)
+
+    # Set-Cookie header of a response
+    driver.performance_log.events.append({"method": "Network.responseReceivedExtraInfo",
+                                          "params": {"headers": {"Set-Cookie": "a=1"}}})
+    session.sync_cookies()
+    assert (driver.fetches, driver.scripts) == (3, 4)
+
+    session.close()
+    assert driver.performance_log.subscribers == []
@@ -0,0 +1,79 @@
+"""
+    import of the package root must stay cheap: selenium and webdriver_manager are loaded on first use only,
+    and the hot paths (Element, WaitList, Driver) load only what they use
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# seconds for `import easy_chrome` in a fresh interpreter, best of RUNS
+IMPORT_BUDGET = 0.05
+# seconds for the easy_chrome modules of a hot path, its third party modules are imported before
+HOT_PATH_BUDGETS = {"from easy_chrome import Element": 0.02,
+                    "from easy_chrome import WaitList": 0.02,
+                    "from easy_chrome import Driver": 0.06}
+RUNS = 3
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import importlib, json, sys, time
+for name in json.loads(sys.argv[2]):
+    importlib.import_module(name)
+before = set(sys.modules)
+start = time.perf_counter()
+exec(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(set(sys.modules) - before)}))
+"""
+
+
+def _probe(statement: str = "import easy_chrome", preload: list = ()) -> dict:
+    """
+    run statement in a fresh interpreter, after importing preload modules
+    :return: {'elapsed': seconds, 'modules': modules loaded by statement}
+    """
+    output = subprocess.run([sys.executable, "-c", _PROBE, statement, json.dumps(list(preload))], cwd=ROOT,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def _loaded(result: dict, package: str) -> bool:
+    return any(name == package or name.startswith(package + ".") for name in result["modules"])
+
+
+def test_import_does_not_load_heavy_dependencies():
+    result = _probe()
+    assert not _loaded(result, "selenium")
+    assert not _loaded(result, "webdriver_manager")
+
+
+def test_import_time_budget():
+    elapsed = min(_probe()["elapsed"] for _ in range(RUNS))
+    assert elapsed < IMPORT_BUDGET, f"import easy_chrome took {elapsed:.3f}s, budget is {IMPORT_BUDGET}s"
+
+
+@pytest.mark.parametrize("statement", ["from easy_chrome import Element", "from easy_chrome import WaitList"])
+def test_element_and_wait_list_do_not_load_driver(statement):
+    result = _probe(statement)
+    assert not _loaded(result, "easy_chrome.driver")
+    assert not _loaded(result, "webdriver_manager")
+    assert not _loaded(result, "requests")
+
+
+def test_driver_does_not_load_driver_manager_and_requests():
+    # both are needed by set_chrome (driver install) and http_session only
+    result = _probe("from easy_chrome import Driver")
+    assert not _loaded(result, "webdriver_manager.chrome")
+    assert not _loaded(result, "requests")
+
+
+@pytest.mark.parametrize("statement", list(HOT_PATH_BUDGETS))
+def test_hot_path_import_time_budget(statement):
+    third_party = [name for name in _probe(statement)["modules"] if name.split(".")[0] != "easy_chrome"]
+    elapsed = min(_probe(statement, third_party)["elapsed"] for _ in range(RUNS))
+    budget = HOT_PATH_BUDGETS[statement]
+    assert elapsed < budget, f"{statement} took {elapsed:.3f}s without third party imports, budget is {budget}s"
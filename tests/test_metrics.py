@@ -0,0 +1,142 @@
+"""
+    command attribution and histograms of easy_chrome.metrics, without a browser
+"""
+
+import os
+import sys
+
+from easy_chrome import metrics
+from easy_chrome.metrics import BUCKETS, Histogram, Metrics, _qualname, find_shortcut
+
+# same call chain as Driver: shortcut -> selenium -> execute -> _execute_timed -> find_shortcut
+_DRIVER_SOURCE = """
+class Driver:
+    def execute(self, command):
+        return self._execute_timed(command)
+
+    def _execute_timed(self, command):
+        return find_shortcut(depth=3)
+
+    def wait_visible(self):
+        return selenium_execute_script(self)
+"""
+
+_SELENIUM_SOURCE = """
+def selenium_execute_script(driver):
+    return driver.execute("executeScript")
+"""
+
+
+def _load(source: str, filename: str, namespace: dict) -> dict:
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace
+
+
+def _driver():
+    namespace = {"find_shortcut": find_shortcut}
+    _load(_SELENIUM_SOURCE, os.path.join(os.path.dirname(metrics._PACKAGE_DIR), "selenium", "webdriver.py"),
+          namespace)
+    _load(_DRIVER_SOURCE, os.path.join(metrics._PACKAGE_DIR, "driver.py"), namespace)
+    return namespace["Driver"](), namespace["selenium_execute_script"]
+
+
+def test_plain_selenium_command_has_no_shortcut():
+    driver, selenium_execute_script = _driver()
+    assert selenium_execute_script(driver) is None
+
+
+def test_command_is_attributed_to_outermost_shortcut():
+    driver, _ = _driver()
+    assert driver.wait_visible() == "Driver.wait_visible"
+
+
+class _Py310Code:
+    """code object of python < 3.11, without co_qualname"""
+
+    def __init__(self, code):
+        self._code = code
+
+    def __getattr__(self, name):
+        if name == "co_qualname":
+            raise AttributeError(name)
+        return getattr(self._code, name)
+
+
+class _Frame:
+    def __init__(self, frame):
+        self.f_code = _Py310Code(frame.f_code)
+        self.f_locals = frame.f_locals
+
+
+class _Base:
+    def shortcut(self):
+        return _Frame(sys._getframe())
+
+    @classmethod
+    def build(cls):
+        return _Frame(sys._getframe())
+
+
+class _Child(_Base):
+    pass
+
+
+def test_qualname_without_co_qualname():
+    assert _qualname(_Child().shortcut()) == "_Base.shortcut"
+    assert _qualname(_Child.build()) == "_Base.build"
+    assert _qualname(_Frame(sys._getframe())) == "test_qualname_without_co_qualname"
+
+
+def test_quantile_interpolates_inside_bucket():
+    histogram = Histogram()
+    for _ in range(10):
+        histogram.observe(0.003)
+    # all samples are in bucket (0.0025, 0.005]
+    assert histogram.quantile(0.5) == 0.0025 + (0.005 - 0.0025) * 0.5
+    assert histogram.quantile(1) == 0.005
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_quantile_spans_buckets():
+    histogram = Histogram()
+    for duration in (0.0005,) * 9 + (0.2,):
+        histogram.observe(duration)
+    assert histogram.quantile(0.5) < 0.001
+    # 10th sample is in bucket (0.1, 0.25]
+    assert 0.1 < histogram.quantile(0.99) <= 0.25
+
+
+def test_quantile_of_overflow_bucket_is_last_bound():
+    histogram = Histogram()
+    histogram.observe(120)
+    assert histogram.quantile(0.99) == BUCKETS[-2]
+
+
+def test_summary_merges_shortcuts_by_command():
+    metrics_ = Metrics()
+    metrics_.record("executeScript", "Driver.wait_visible", 0.01)
+    metrics_.record("executeScript", None, 0.02, error=True)
+    summary = metrics_.summary()
+    assert summary["commands"]["executeScript"]["count"] == 2
+    assert summary["commands"]["executeScript"]["errors"] == 1
+    assert set(summary["shortcuts"]) == {"Driver.wait_visible", ""}
+
+
+def test_to_prometheus_buckets_are_cumulative():
+    metrics_ = Metrics()
+    metrics_.record("executeScript", "Driver.wait_visible", 0.003)
+    metrics_.record("executeScript", "Driver.wait_visible", 0.2, error=True)
+    metrics_.record("get", None, 0.003)
+    text = metrics_.to_prometheus()
+
+    name = "easy_chrome_command_duration_seconds"
+    labels = 'command="executeScript",shortcut="Driver.wait_visible"'
+    assert f"# TYPE {name} histogram" in text
+    assert f'{name}_bucket{{{labels},le="0.0025"}} 0' in text
+    assert f'{name}_bucket{{{labels},le="0.005"}} 1' in text
+    assert f'{name}_bucket{{{labels},le="0.25"}} 2' in text
+    assert f'{name}_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"{name}_count{{{labels}}} 2" in text
+    assert f"easy_chrome_command_errors_total{{{labels}}} 1" in text
+    assert f'{name}_count{{command="get",shortcut=""}} 1' in text
+    assert text.endswith("\n")
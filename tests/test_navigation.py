@@ -0,0 +1,139 @@
+"""
+    NavigationTracker: redirect chain, load state and requests in flight from CDP events
+"""
+
+from __future__ import annotations
+import json
+import threading
+
+from easy_chrome.capture import ResponseCapture
+from easy_chrome.driver import Driver
+from easy_chrome.events import PerformanceLog
+from easy_chrome.navigation import NavigationTracker
+
+MAIN = "main-frame"
+
+
+def _document(request_id: str, url: str, timestamp: float, frame_id: str = MAIN, redirect_status: int | None = None):
+    params = {"requestId": request_id, "type": "Document", "frameId": frame_id, "request": {"url": url},
+              "timestamp": timestamp}
+    if redirect_status is not None:
+        params["redirectResponse"] = {"status": redirect_status}
+    return {"method": "Network.requestWillBeSent", "params": params}
+
+
+def _event(method: str, **params):
+    return {"method": method, "params": params}
+
+
+def test_redirect_chain_with_status_and_time():
+    tracker = NavigationTracker(MAIN)
+    navigated, networked = tracker.feed([
+        _document("1", "http://example.com/", 10.0),
+        # a redirect keeps the request id of the first request
+        _document("1", "https://example.com/", 10.2, redirect_status=301),
+        _document("2", "https://example.com/home", 10.5, redirect_status=302),
+        _event("Network.responseReceived", requestId="2", type="Document", response={"status": 200}),
+        _event("Network.loadingFinished", requestId="1", timestamp=10.6),
+        _event("Network.loadingFinished", requestId="2", timestamp=10.7),
+        _event("Page.loadEventFired", timestamp=11.0),
+    ])
+    assert navigated and networked
+    assert tracker.loaded
+    assert tracker.navigations == 3
+    assert not tracker.inflight
+
+    navigation = tracker.result(settled=True, network_idle=True)
+    assert navigation.url == "https://example.com/home"
+    assert navigation.redirect_count == 2
+    assert [(hop["url"], hop["status"]) for hop in navigation.redirects] == [
+        ("http://example.com/", 301), ("https://example.com/", 302), ("https://example.com/home", 200)]
+    assert [round(hop["time"], 3) for hop in navigation.redirects] == [0.0, 0.2, 0.5]
+    assert round(navigation.duration, 3) == 1.0
+    assert "request_id" not in navigation.redirects[0]
+
+
+def test_new_document_resets_load_state():
+    tracker = NavigationTracker(MAIN)
+    tracker.feed([_document("1", "https://example.com/", 1.0), _event("Page.loadEventFired", timestamp=1.5)])
+    assert tracker.loaded
+
+    navigated, _ = tracker.feed([_document("2", "https://example.com/next", 2.0)])
+    assert navigated
+    assert not tracker.loaded
+
+
+def test_subframe_documents_and_subresources_are_network_only():
+    tracker = NavigationTracker(MAIN)
+    navigated, networked = tracker.feed([
+        _document("1", "https://ads.example.com/", 1.0, frame_id="iframe"),
+        _event("Network.requestWillBeSent", requestId="2", type="Image", frameId=MAIN,
+               request={"url": "https://example.com/a.png"}, timestamp=1.1),
+    ])
+    assert (navigated, networked) == (False, True)
+    assert tracker.navigations == 0
+    assert tracker.inflight == {"1", "2"}
+
+    tracker.feed([_event("Network.loadingFailed", requestId="1"), _event("Network.loadingFinished", requestId="2")])
+    assert not tracker.inflight
+
+
+def test_result_without_events():
+    navigation = NavigationTracker(MAIN).result(settled=False, network_idle=True)
+    assert navigation.url is None
+    assert navigation.redirects == []
+    assert navigation.redirect_count == 0
+    assert navigation.duration == 0.0
+
+
+class FakeDriver:
+    """answers get_log('performance') with queued events, once wait_redirected has subscribed next to the others"""
+    performance_log_enabled = True
+    is_ready = False
+
+    def __init__(self, events: list[dict]):
+        self.performance_log = PerformanceLog(self)
+        self.events = events
+        self.others = 1
+        self.lock = threading.Lock()
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == "Page.getFrameTree"
+        return {"frameTree": {"frame": {"id": MAIN}}}
+
+    def get_log(self, name):
+        assert name == "performance"
+        with self.lock:
+            if len(self.performance_log._subscribers) <= self.others:
+                return []
+            events, self.events = self.events, []
+        return [{"message": json.dumps({"message": event}), "timestamp": 0} for event in events]
+
+
+REDIRECT = [
+    _document("1", "http://a/", 1.0),
+    _document("1", "http://b/final", 1.1, redirect_status=302),
+    _event("Network.responseReceived", requestId="1", type="Document", response={"status": 200}),
+    _event("Network.loadingFinished", requestId="1", timestamp=1.2),
+    _event("Page.loadEventFired", timestamp=1.3),
+]
+
+
+def test_wait_redirected_follows_events():
+    driver = FakeDriver(list(REDIRECT))
+    driver.others = 0
+    navigation = Driver.wait_redirected(driver, limit_time=5, settle_time=0, poll_interval=0.01)
+    assert (navigation.url, navigation.redirect_count, navigation.settled) == ("http://b/final", 1, True)
+    assert driver.performance_log._subscribers == []
+
+
+def test_wait_redirected_sees_events_drained_by_capture_thread():
+    driver = FakeDriver(list(REDIRECT))
+    capture = ResponseCapture(driver, callback=lambda response: None, poll_interval=0.001).start()
+    try:
+        navigation = Driver.wait_redirected(driver, limit_time=5, settle_time=0, poll_interval=0.05)
+    finally:
+        capture.stop()
+    assert capture.error is None
+    assert (navigation.url, navigation.redirect_count, navigation.settled) == ("http://b/final", 1, True)
+    assert driver.performance_log._subscribers == []
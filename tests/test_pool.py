@@ -0,0 +1,115 @@
+"""
+    DriverPool: reuse, recycling, launch errors and close, with a fake driver class instead of chrome
+"""
+
+from __future__ import annotations
+import threading
+
+import pytest
+
+from easy_chrome.pool import DriverPool
+
+
+class FakeDriver:
+    # set_chrome raises this error if set, blocks until gate is set
+    launch_error = None
+    gate = None
+    launched = []
+
+    def __init__(self):
+        self.resets = 0
+        self.quit_count = 0
+        self.broken = False
+
+    @classmethod
+    def set_chrome(cls, **kwargs):
+        if cls.gate is not None:
+            cls.gate.wait(5)
+        if cls.launch_error is not None:
+            raise cls.launch_error
+        driver = cls()
+        cls.launched.append(driver)
+        return driver
+
+    def reset(self, url):
+        if self.broken:
+            raise RuntimeError("chrome is not responding")
+        self.resets += 1
+
+    def quit(self):
+        self.quit_count += 1
+
+
+@pytest.fixture
+def driver_cls(monkeypatch):
+    monkeypatch.setattr(FakeDriver, "launch_error", None)
+    monkeypatch.setattr(FakeDriver, "gate", None)
+    monkeypatch.setattr(FakeDriver, "launched", [])
+    return FakeDriver
+
+
+def test_driver_is_reset_and_reused(driver_cls):
+    with DriverPool(size=1, driver_cls=driver_cls) as pool:
+        with pool.driver(timeout=5) as first:
+            pass
+        with pool.driver(timeout=5) as second:
+            pass
+        assert first is second
+        assert first.resets == 2
+        assert pool.stats["checkouts"] == 2
+    assert first.quit_count == 1
+
+
+def test_driver_is_recycled_after_max_uses_and_crash(driver_cls):
+    with DriverPool(size=1, max_uses=1, driver_cls=driver_cls) as pool:
+        with pool.driver(timeout=5) as first:
+            pass
+        with pool.driver(timeout=5) as second:
+            pass
+        assert first is not second
+        assert (first.resets, first.quit_count) == (0, 1)
+        assert pool.stats["recycled"] == 2
+
+    pool = DriverPool(size=1, max_uses=5, driver_cls=driver_cls)
+    with pool.driver(timeout=5) as driver:
+        driver.broken = True
+    assert driver.quit_count == 1
+    assert pool.stats["crashed"] == 1
+    pool.close()
+
+
+def test_checkout_raises_after_launch_errors_in_a_row(driver_cls):
+    error = OSError("chrome not found")
+    driver_cls.launch_error = error
+    pool = DriverPool(size=2, max_launch_errors=3, driver_cls=driver_cls)
+    # launches run in parallel, more than max_launch_errors can fail before checkout sees them
+    with pytest.raises(RuntimeError, match=r"failed [34] times in a row") as info:
+        with pool.driver(timeout=30):
+            pass
+    assert info.value.__cause__ is error
+
+    # the next checkout launches again
+    driver_cls.launch_error = None
+    with pool.driver(timeout=5) as driver:
+        assert driver in driver_cls.launched
+    pool.close()
+
+
+def test_drivers_launched_or_returned_after_close_are_quit(driver_cls):
+    driver_cls.gate = threading.Event()
+    pool = DriverPool(size=2, driver_cls=driver_cls)
+    driver_cls.gate.set()
+    with pool.driver(timeout=5) as borrowed:
+        pool.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            with pool.driver(timeout=5):
+                pass
+    assert borrowed.quit_count == 1
+
+    # the other launch finishes after close
+    for _ in range(100):
+        if len(driver_cls.launched) == 2 and all(driver.quit_count for driver in driver_cls.launched):
+            break
+        threading.Event().wait(0.05)
+    assert [driver.quit_count for driver in driver_cls.launched] == [1, 1]
+    assert pool.stats["idle"] == 0
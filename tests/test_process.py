@@ -0,0 +1,125 @@
+"""
+    process registry and reaping of easy_chrome.process, with fake pids: no process is killed
+"""
+
+import json
+import os
+
+import pytest
+
+from easy_chrome import process
+from easy_chrome.supervisor import DriverSupervisor
+
+
+@pytest.fixture
+def processes(tmp_path, monkeypatch):
+    """
+    fake process table: pid -> name, the owner of the test is alive
+    :return: (table, killed roots)
+    """
+    table = {os.getpid(): "python"}
+    killed = []
+    monkeypatch.setattr(process, "REGISTRY_DIR", str(tmp_path / "pids"))
+    monkeypatch.setattr(process, "pid_exists", lambda pid: pid in table)
+    monkeypatch.setattr(process, "process_name", lambda pid: table.get(pid, ""))
+    monkeypatch.setattr(process, "children", lambda pid, recursive=True: [])
+    monkeypatch.setattr(process, "kill_tree", lambda pid: (killed.append(pid), table.pop(pid, None)))
+    return table, killed
+
+
+def _record(driver: int, owner: int, browsers: list[int], detach: bool = False):
+    os.makedirs(process.REGISTRY_DIR, exist_ok=True)
+    with open(os.path.join(process.REGISTRY_DIR, f"{driver}.json"), "w") as f:
+        json.dump({"owner": owner, "driver": driver, "browsers": browsers, "detach": detach, "created": 0}, f)
+
+
+def test_register_and_unregister(processes, monkeypatch):
+    monkeypatch.setattr(process, "children", lambda pid, recursive=True: [201, 202])
+    path = process.register(100)
+    with open(path) as f:
+        record = json.load(f)
+    assert (record["owner"], record["driver"], record["browsers"], record["detach"]) == (os.getpid(), 100, [201, 202],
+                                                                                         False)
+    assert process.registered_browsers(100) == [201, 202]
+
+    process.unregister(100)
+    assert not os.path.exists(path)
+    assert process.registered_browsers(100) == []
+
+
+def test_reap_orphans_kills_trees_of_dead_owners(processes):
+    table, killed = processes
+    table.update({100: "chromedriver", 101: "chrome", 200: "chromedriver"})
+    _record(100, owner=999999, browsers=[101])
+    _record(200, owner=os.getpid(), browsers=[])
+
+    assert process.reap_orphans() == [100, 101]
+    assert killed == [100, 101]
+    # record of a live owner is kept
+    assert os.listdir(process.REGISTRY_DIR) == ["200.json"]
+
+
+def test_reap_orphans_skips_reused_and_gone_pids(processes):
+    table, killed = processes
+    # 101 is gone, 102 is reused by another program
+    table.update({100: "chromedriver", 102: "postgres"})
+    _record(100, owner=999999, browsers=[101, 102])
+
+    assert process.reap_orphans() == [100]
+    assert killed == [100]
+    assert os.listdir(process.REGISTRY_DIR) == []
+
+
+def test_reap_orphans_keeps_detached_sessions(processes):
+    table, killed = processes
+    table.update({100: "chromedriver"})
+    _record(100, owner=999999, browsers=[], detach=True)
+
+    assert process.reap_orphans() == []
+    assert os.listdir(process.REGISTRY_DIR) == ["100.json"]
+    assert process.reap_orphans(include_detached=True) == [100]
+    assert os.listdir(process.REGISTRY_DIR) == []
+
+
+def test_reap_orphans_ignores_broken_records(processes):
+    os.makedirs(process.REGISTRY_DIR)
+    with open(os.path.join(process.REGISTRY_DIR, "100.json"), "w") as f:
+        f.write("{")
+    assert process.reap_orphans() == []
+
+
+def test_reap_orphans_without_registry(processes):
+    assert process.reap_orphans() == []
+
+
+def test_kill_trees_skips_duplicates_and_other_programs(processes):
+    table, killed = processes
+    table.update({100: "chromedriver", 101: "Google Chrome Helper (Renderer)", 102: "bash"})
+    assert process.kill_trees([100, 101, 101, 102, 103]) == [100, 101]
+    assert killed == [100, 101]
+
+
+def test_supervisor_collects_tree_before_quit(processes, monkeypatch):
+    table, killed = processes
+    table.update({100: "chromedriver", 101: "chrome", 102: "chrome", 103: "chrome"})
+    _record(100, owner=os.getpid(), browsers=[101])
+    tree = {100: [101, 102]}
+    monkeypatch.setattr(process, "children", lambda pid, recursive=True: tree.get(pid, []))
+
+    class FakeDriver:
+        class service:
+            class process:
+                pid = 100
+
+        def quit(self):
+            # chromedriver exits, a renderer is left behind and reparented
+            tree.clear()
+            del table[100]
+
+    supervisor = DriverSupervisor.__new__(DriverSupervisor)
+    supervisor.driver = FakeDriver()
+    supervisor._stop()
+
+    assert killed == [101, 102]
+    assert 103 in table
+    assert process.registered_browsers(100) == []
@@ -0,0 +1,91 @@
+"""
+    clone_profile: copies of a profile template never share files with it, and never carry its lock files
+"""
+
+import os
+import shutil
+
+import pytest
+
+from easy_chrome import profile
+from easy_chrome.profile import clone_profile
+
+
+@pytest.fixture
+def template(tmp_path):
+    root = tmp_path / "template"
+    cache = root / "Default" / "Cache" / "Cache_Data"
+    cache.mkdir(parents=True)
+    (cache / "index").write_bytes(b"index")
+    (cache / "f_000001").write_bytes(b"asset")
+    (root / "Local State").write_text("{}")
+    (root / "SingletonLock").write_text("host-123")
+    (root / "Default" / "LOCK").write_text("")
+    return root
+
+
+def _files(root) -> dict:
+    return {os.path.relpath(os.path.join(path, name), root): open(os.path.join(path, name), "rb").read()
+            for path, _, names in os.walk(root) for name in names}
+
+
+def _expected(template) -> dict:
+    return {name: content for name, content in _files(template).items()
+            if os.path.basename(name) not in profile.LOCK_FILES}
+
+
+def test_copy_mode_skips_lock_files_and_shares_nothing(template, tmp_path):
+    dest = clone_profile(str(template), str(tmp_path / "clone"), mode="copy")
+    assert _files(dest) == _expected(template)
+
+    cloned = os.path.join(dest, "Default", "Cache", "Cache_Data", "f_000001")
+    assert os.stat(cloned).st_nlink == 1
+    # chrome rewrites cache entries in place
+    with open(cloned, "r+b") as f:
+        f.write(b"ASSET")
+    assert (template / "Default" / "Cache" / "Cache_Data" / "f_000001").read_bytes() == b"asset"
+
+
+def test_auto_mode_clones_to_temp_directory(template):
+    dest = clone_profile(str(template))
+    try:
+        assert os.path.basename(dest).startswith("easy_chrome_profile_")
+        assert _files(dest) == _expected(template)
+    finally:
+        shutil.rmtree(dest)
+
+
+def test_reflink_copy_removes_lock_files(template, tmp_path, monkeypatch):
+    def fake_cp(command, **kwargs):
+        # cp -a --reflink=always template/. dest
+        shutil.copytree(os.path.dirname(command[-2]), command[-1], dirs_exist_ok=True)
+
+    monkeypatch.setattr(profile.sys, "platform", "linux")
+    monkeypatch.setattr(profile.subprocess, "run", fake_cp)
+    dest = clone_profile(str(template), str(tmp_path / "clone"), mode="reflink")
+    assert _files(dest) == _expected(template)
+
+
+def test_auto_mode_falls_back_to_copy_after_partial_reflink(template, tmp_path, monkeypatch):
+    def partial_reflink(template_dir, dest):
+        os.makedirs(dest, exist_ok=True)
+        with open(os.path.join(dest, "partial"), "w") as f:
+            f.write("half")
+        return False
+
+    monkeypatch.setattr(profile, "_reflink_copy", partial_reflink)
+    dest = clone_profile(str(template), str(tmp_path / "clone"))
+    assert _files(dest) == _expected(template)
+
+
+def test_reflink_mode_raises_when_not_supported(template, tmp_path, monkeypatch):
+    monkeypatch.setattr(profile, "_reflink_copy", lambda template_dir, dest: False)
+    with pytest.raises(OSError):
+        clone_profile(str(template), str(tmp_path / "clone"), mode="reflink")
+
+
+def test_invalid_arguments(template, tmp_path):
+    with pytest.raises(ValueError):
+        clone_profile(str(template), mode="hardlink")
+    with pytest.raises(FileNotFoundError):
+        clone_profile(str(tmp_path / "missing"))
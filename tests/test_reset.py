@@ -0,0 +1,107 @@
+"""
+    Driver.reset without browser contexts (profile_template, or contexts not available): site data of every visited
+    origin is cleared, against a fake driver
+"""
+
+from __future__ import annotations
+
+from easy_chrome.driver import Driver
+from easy_chrome.navigation import OriginTracker
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class FakeLog:
+    def __init__(self, events: list[dict], subscriber):
+        self.events = events
+        self.subscriber = subscriber
+
+    def poll(self):
+        events, self.events = self.events, []
+        self.subscriber(events)
+        return events
+
+
+class FakeDriver:
+    reset = Driver.reset
+    _clear_site_data = Driver._clear_site_data
+    _tab_origins = Driver._tab_origins
+    _browser_context_id = None
+    _download_tracker = None
+    _origin_tracker = None
+
+    def __init__(self, tabs: dict, profile_dir: str | None = "/tmp/profile"):
+        """
+        :param tabs: handle -> (history urls, frame tree)
+        """
+        self.tabs = tabs
+        self.window_handles = list(tabs)
+        self.profile_dir = profile_dir
+        self.current = self.window_handles[0]
+        self.switch_to = FakeSwitchTo(self)
+        self.cleared = []
+        self.cookies_cleared = False
+        self.url = None
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Target.createBrowserContext":
+            raise AssertionError("profile_dir keeps the profile, no browser context")
+        if cmd == "Page.getNavigationHistory":
+            return {"currentIndex": 0, "entries": [{"url": url} for url in self.tabs[self.current][0]]}
+        if cmd == "Page.getFrameTree":
+            return {"frameTree": self.tabs[self.current][1]}
+        if cmd == "Storage.clearDataForOrigin":
+            self.cleared.append(params["origin"])
+        elif cmd == "Network.clearBrowserCookies":
+            self.cookies_cleared = True
+        return {}
+
+    def close(self):
+        del self.tabs[self.current]
+        self.window_handles.remove(self.current)
+
+    def get(self, url):
+        self.url = url
+
+
+def _frame(url: str, *children) -> dict:
+    tree = {"frame": {"url": url}}
+    if children:
+        tree["childFrames"] = list(children)
+    return tree
+
+
+def test_history_and_frames_of_open_tabs_are_cleared():
+    driver = FakeDriver({
+        "tab-1": (["about:blank", "https://a.example/", "https://b.example/page"],
+                  _frame("https://b.example/page", _frame("https://ads.example/frame", _frame("data:text/html,")))),
+        "tab-2": (["http://c.example:8080/x"], _frame("http://c.example:8080/x")),
+    })
+    driver.reset("about:blank")
+
+    assert driver.cleared == ["http://c.example:8080", "https://a.example", "https://ads.example", "https://b.example"]
+    assert driver.cookies_cleared
+    assert driver.window_handles == ["tab-1"]
+    assert driver.url == "about:blank"
+
+
+def test_origins_from_performance_log_are_cleared_once():
+    driver = FakeDriver({"tab-1": (["https://final.example/"], _frame("https://final.example/"))})
+    driver._origin_tracker = OriginTracker()
+    driver.performance_log = FakeLog([
+        {"method": "Network.requestWillBeSent",
+         "params": {"type": "Document", "request": {"url": "https://hop.example/redirect"}}},
+        {"method": "Network.requestWillBeSent",
+         "params": {"type": "Image", "request": {"url": "https://cdn.example/a.png"}}},
+        {"method": "Page.frameNavigated", "params": {"frame": {"url": "https://closed-tab.example/"}}},
+    ], driver._origin_tracker)
+    driver.reset()
+
+    assert driver.cleared == ["https://closed-tab.example", "https://final.example", "https://hop.example"]
+    assert driver._origin_tracker.origins == set()
@@ -0,0 +1,95 @@
+"""
+    TabScheduler: completion order, tab reuse, page timeout and blank tabs of blocked urls, against a fake driver
+    which, like chromedriver, makes a script wait for the page load of its tab
+"""
+
+from __future__ import annotations
+from time import monotonic
+
+from selenium.common.exceptions import TimeoutException
+
+from easy_chrome import scripts
+from easy_chrome.tabs import TabScheduler
+
+
+class FakeDriver:
+    performance_log_enabled = False
+
+    def __init__(self, delays: dict, blocked_urls: list[str] | None = None):
+        """
+        :param delays: url -> seconds until its page is loaded, None for never, default 0
+        """
+        self.delays = delays
+        self.blocked_urls = blocked_urls or []
+        self.tabs = {"control": ("about:control", 0.0)}
+        self.current_window_handle = "control"
+        self.switch_to = self
+        self.opened_from = []
+        self.closed = []
+
+    @property
+    def window_handles(self):
+        return list(self.tabs)
+
+    @property
+    def page_source(self):
+        return f"<{self.tabs[self.current_window_handle][0]}>"
+
+    def window(self, handle):
+        assert handle in self.tabs
+        self.current_window_handle = handle
+
+    def _load(self, url: str) -> tuple[str, float]:
+        delay = self.delays.get(url, 0)
+        return url, float("inf") if delay is None else monotonic() + delay
+
+    def execute_script(self, script, *args):
+        handle = self.current_window_handle
+        url, loaded_at = self.tabs[handle]
+        if script == scripts.TAB_STATE:
+            return {"ready": monotonic() >= loaded_at and url != "about:blank", "url": url}
+        assert monotonic() >= loaded_at, f"script would wait for the page load of {url}"
+        if script == scripts.TAB_OPEN:
+            self.opened_from.append(handle)
+            self.tabs[f"tab-{len(self.opened_from)}"] = self._load(args[0])
+        elif script == scripts.TAB_NAVIGATE:
+            self.tabs[handle] = self._load(args[0])
+        else:
+            raise AssertionError(f"unexpected script: {script}")
+
+    def close(self):
+        self.closed.append(self.tabs.pop(self.current_window_handle)[0])
+
+
+def test_results_in_completion_order_and_tabs_are_reused():
+    driver = FakeDriver({"a": 0.3})
+    results = list(TabScheduler(driver, max_tabs=2, poll_interval=0.01).run(["a", "b", "c", "d"]))
+
+    assert [(result.url, result.value) for result in results] == [("b", "<b>"), ("c", "<c>"), ("d", "<d>"),
+                                                                  ("a", "<a>")]
+    assert all(result.ok for result in results)
+    assert driver.opened_from == ["control", "control"]
+    assert driver.window_handles == ["control"]
+    assert driver.current_window_handle == "control"
+
+
+def test_timed_out_tab_is_closed_and_next_url_gets_a_new_tab():
+    driver = FakeDriver({"slow": None})
+    results = list(TabScheduler(driver, max_tabs=1, page_timeout=0.2, poll_interval=0.01).run(["slow", "fast"]))
+
+    assert [result.url for result in results] == ["slow", "fast"]
+    assert isinstance(results[0].error, TimeoutException)
+    assert results[0].duration > 0.2
+    assert results[1].value == "<fast>"
+    assert driver.closed == ["slow", "fast"]
+    assert driver.opened_from == ["control", "control"]
+
+
+def test_blocked_urls_open_blank_tabs_from_control_tab():
+    driver = FakeDriver({"a": 0.1, "b": 0.1, "c": 0.1}, blocked_urls=["*.png"])
+    results = list(TabScheduler(driver, max_tabs=3, poll_interval=0.01).run(["a", "b", "c"]))
+
+    assert sorted(result.value for result in results) == ["<a>", "<b>", "<c>"]
+    # every tab is opened without waiting for the page loads of the others
+    assert driver.opened_from == ["control", "control", "control"]
+    assert max(result.duration for result in results) < 0.3
@@ -0,0 +1,142 @@
+"""
+    chromedriver resolution cache of easy_chrome.version: manifest keyed by chrome binary, atomic install, file lock
+"""
+
+import os
+import threading
+
+import pytest
+
+from easy_chrome import version
+
+
+class FakeManager:
+    """stands in for webdriver_manager ChromeDriverManager, counts version probes and installs"""
+    probes = 0
+    installs = 0
+    browser_version = "120.0.6099.109"
+    source_dir = None
+
+    def __init__(self, driver_version=None):
+        self.driver = self
+
+    def get_os_type(self):
+        return "linux64"
+
+    def get_browser_version_from_os(self):
+        FakeManager.probes += 1
+        return self.browser_version
+
+    def install(self):
+        FakeManager.installs += 1
+        path = os.path.join(self.source_dir, "chromedriver")
+        with open(path, "wb") as f:
+            f.write(b"driver")
+        return path
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    source_dir = tmp_path / "wdm"
+    source_dir.mkdir()
+    chrome = tmp_path / "chrome"
+    chrome.write_bytes(b"chrome 120")
+
+    monkeypatch.setattr(version, "DEFAULT_USER_HOME_CACHE_PATH", str(cache_dir))
+    monkeypatch.setattr(version, "MANIFEST_PATH", str(cache_dir / "easy_chrome_manifest.json"))
+    monkeypatch.setattr(version, "LOCK_PATH", str(cache_dir / "easy_chrome.lock"))
+    monkeypatch.setattr(version, "_find_chrome_binary", lambda: str(chrome))
+    monkeypatch.setattr("webdriver_manager.chrome.ChromeDriverManager", FakeManager)
+    monkeypatch.setattr(FakeManager, "probes", 0)
+    monkeypatch.setattr(FakeManager, "installs", 0)
+    monkeypatch.setattr(FakeManager, "source_dir", str(source_dir))
+    return cache_dir, chrome
+
+
+def test_install_records_manifest(cache):
+    cache_dir, chrome = cache
+    path = version.get_driver_path()
+
+    assert path == str(cache_dir / "chromedriver_120")
+    assert open(path, "rb").read() == b"driver"
+    assert os.access(path, os.X_OK)
+    manifest = version._read_manifest()
+    assert manifest[str(chrome)]["driver_path"] == path
+    assert manifest[str(chrome)]["version"] == FakeManager.browser_version
+    # only the driver, the manifest and the lock file, no temp file is left
+    assert sorted(os.listdir(cache_dir)) == ["chromedriver_120", "easy_chrome.lock", "easy_chrome_manifest.json"]
+
+
+def test_manifest_hit_skips_version_probe(cache):
+    path = version.get_driver_path()
+    assert version.get_driver_path() == path
+    assert (FakeManager.probes, FakeManager.installs) == (1, 1)
+
+
+def test_updated_chrome_is_probed_again(cache, monkeypatch):
+    _, chrome = cache
+    version.get_driver_path()
+    chrome.write_bytes(b"chrome 121, bigger")
+    monkeypatch.setattr(FakeManager, "browser_version", "121.0.6167.85")
+    path = version.get_driver_path()
+
+    assert path.endswith("chromedriver_121")
+    assert (FakeManager.probes, FakeManager.installs) == (2, 2)
+
+
+def test_deleted_driver_is_installed_again(cache):
+    os.remove(version.get_driver_path())
+    assert os.path.exists(version.get_driver_path())
+    assert FakeManager.installs == 2
+
+
+def test_unknown_chrome_binary_does_not_take_lock_when_installed(cache, monkeypatch):
+    monkeypatch.setattr(version, "_find_chrome_binary", lambda: None)
+    path = version.get_driver_path()
+    assert version._read_manifest() == {}
+
+    def no_lock(path):
+        raise AssertionError("lock must not be taken")
+
+    monkeypatch.setattr(version, "_file_lock", no_lock)
+    assert version.get_driver_path() == path
+    assert FakeManager.installs == 1
+
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_bytes(b"old")
+
+    def fail(f):
+        f.write(b"half")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        version._atomic_write(str(path), fail)
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["manifest.json"]
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    lock_path = str(tmp_path / "lock")
+    held, release, acquired = threading.Event(), threading.Event(), threading.Event()
+
+    def holder():
+        with version._file_lock(lock_path):
+            held.set()
+            release.wait(5)
+
+    def waiter():
+        with version._file_lock(lock_path):
+            acquired.set()
+
+    threads = [threading.Thread(target=holder), threading.Thread(target=waiter)]
+    threads[0].start()
+    assert held.wait(5)
+    threads[1].start()
+    assert not acquired.wait(0.2)
+    release.set()
+    assert acquired.wait(5)
+    for thread in threads:
+        thread.join()
@@ -0,0 +1,137 @@
+"""
+    WaitList.generate_combined: xpath and url conditions of wait_any_of / wait_all_of / wait_none_of,
+    evaluated against a fake driver which answers the CHECK_XPATHS script
+"""
+
+from __future__ import annotations
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+from easy_chrome import scripts
+from easy_chrome.utils import WaitList
+
+
+class FakeDriver:
+    def __init__(self, url: str = "https://example.com/home", xpaths: dict | None = None):
+        """
+        :param url: window.location.href
+        :param xpaths: (condition, xpath) -> bool, missing pairs are False
+        """
+        self.url = url
+        self.xpaths = xpaths or {}
+        self.calls = 0
+        self.error = None
+
+    def execute_script(self, script, conditions):
+        assert script == scripts.CHECK_XPATHS
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return {"url": self.url,
+                "results": [self.xpaths.get((condition, xpath), False) for condition, xpath in conditions]}
+
+
+def _condition(result):
+    calls = []
+
+    def condition(driver):
+        calls.append(driver)
+        return result
+
+    condition.calls = calls
+    return condition
+
+
+def test_any_returns_matched_conditions():
+    driver = FakeDriver(xpaths={("visible", "//a"): True})
+    combined = WaitList.generate_combined("any", None, visible=["//a", "//b"], url_contains="other")
+    assert combined(driver) == [("visible", "//a")]
+    assert driver.calls == 1
+
+
+def test_any_is_false_when_nothing_matches():
+    combined = WaitList.generate_combined("any", None, presence="//a", url_to_be="https://example.com/")
+    assert combined(FakeDriver()) is False
+
+
+def test_all_needs_every_condition():
+    driver = FakeDriver(xpaths={("presence", "//a"): True})
+    combined = WaitList.generate_combined("all", None, presence=["//a", "//b"])
+    assert combined(driver) is False
+
+    driver.xpaths[("presence", "//b")] = True
+    assert combined(driver) == [("presence", "//a"), ("presence", "//b")]
+
+
+def test_none_returns_true_when_nothing_matches():
+    combined = WaitList.generate_combined("none", None, invisible="//a", url_contains="login")
+    assert combined(FakeDriver()) is True
+    assert combined(FakeDriver(url="https://example.com/login")) is False
+
+
+@pytest.mark.parametrize("key, value, url, expected", [
+    ("url_to_be", "https://example.com/home", "https://example.com/home", True),
+    ("url_to_be", "https://example.com/", "https://example.com/home", False),
+    ("url_contains", "/home", "https://example.com/home", True),
+    ("url_contains", "/login", "https://example.com/home", False),
+    ("url_matches", r"example\.com/h.me$", "https://example.com/home", True),
+    ("url_matches", r"^/home", "https://example.com/home", False),
+    ("url_changes", "https://example.com/", "https://example.com/home", True),
+    ("url_changes", "https://example.com/home", "https://example.com/home", False),
+])
+def test_url_conditions_follow_selenium(key, value, url, expected):
+    combined = WaitList.generate_combined("any", None, **{key: value})
+    assert combined(FakeDriver(url=url)) == ([(key, value)] if expected else False)
+
+
+def test_user_conditions_are_checked_only_when_needed():
+    user = _condition("element")
+    driver = FakeDriver(xpaths={("visible", "//a"): True})
+
+    assert WaitList.generate_combined("any", [user], visible="//a")(driver) == [("visible", "//a")]
+    assert user.calls == []
+
+    assert WaitList.generate_combined("any", [user], visible="//b")(driver) == ["element"]
+    assert len(user.calls) == 1
+
+
+def test_all_and_none_with_user_conditions():
+    matched, unmatched = _condition(True), _condition(False)
+    driver = FakeDriver(xpaths={("presence", "//a"): True})
+
+    # results of user conditions first, in order, like selenium all_of
+    assert WaitList.generate_combined("all", [_condition("first"), _condition("second")], presence="//a")(driver) \
+        == ["first", "second", ("presence", "//a")]
+    assert WaitList.generate_combined("all", [matched, unmatched], presence="//a")(driver) is False
+    assert WaitList.generate_combined("none", [unmatched])(driver) is True
+    assert WaitList.generate_combined("none", [matched])(driver) is False
+
+
+def test_user_conditions_only_do_not_call_script():
+    user = _condition(True)
+    driver = FakeDriver()
+    assert WaitList.generate_combined("any", [user])(driver) == [True]
+    assert driver.calls == 0
+
+
+def test_errors_of_a_navigating_page_retry_next_poll():
+    driver = FakeDriver(xpaths={("presence", "//a"): True})
+    driver.error = WebDriverException("navigating")
+    combined = WaitList.generate_combined("any", None, presence="//a")
+    assert combined(driver) is False
+
+    def stale(_):
+        raise StaleElementReferenceException()
+
+    driver.error = None
+    assert WaitList.generate_combined("all", [stale], presence="//a")(driver) is False
+
+
+def test_invalid_mode_and_key():
+    with pytest.raises(ValueError):
+        WaitList.generate_combined("some", None, presence="//a")
+    with pytest.raises(ValueError):
+        WaitList.generate_combined("any", None, title_is="home")
+    with pytest.raises(TypeError):
+        WaitList.generate_combined("any", None, presence=1)